@@ -4,5 +4,6 @@ set -o errexit
 
 pip install -r requirements.txt
 
-python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+# Both steps are skipped when there's nothing to do (see entrypoint.sh)
+python manage.py collectstatic_if_changed
+python manage.py migrate_locked
@@ -0,0 +1,134 @@
+# backend/core/database.py
+"""
+Production database configuration.
+
+DATABASE_URL (parsed with dj-database-url) describes the primary. Without it
+the older DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT variables are used, so
+existing deployments and docker-compose keep working. Read replicas come
+from DATABASE_REPLICA_URLS, or DB_REPLICA_HOSTS which reuses the primary's
+credentials.
+
+Django 5.0 has no in-process pool, so every worker thread keeps a
+persistent connection (DB_CONN_MAX_AGE) that is health-checked before
+reuse. Set DB_PGBOUNCER=1 when connecting through PgBouncer in transaction
+mode, which can't hold server-side cursors across transactions. PgBouncer
+also refuses the `options` startup parameter, so in that mode the statement
+timeouts aren't sent by Django: set them on the database roles instead
+(ALTER ROLE colace_replica SET statement_timeout = '5s'), and use
+statement_timeout() below for the endpoints that need a tighter one.
+"""
+import os
+
+import dj_database_url
+
+# Per role statement timeouts (ms). Replicas serve the read heavy endpoints
+# (feed, search, profiles), so a runaway query is cut off well before it can
+# tie up a connection for long.
+DEFAULT_STATEMENT_TIMEOUTS = {
+    'primary': 15000,
+    'replica': 5000,
+}
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def statement_timeout_for(role):
+    return env_int(f'DB_STATEMENT_TIMEOUT_{role.upper()}_MS', DEFAULT_STATEMENT_TIMEOUTS[role])
+
+
+def database_config(url=None, role='primary', **fallback):
+    """
+    Builds one DATABASES entry for `role` ('primary' or 'replica').
+    """
+    conn_max_age = env_int('DB_CONN_MAX_AGE', 600)
+    pgbouncer = os.environ.get('DB_PGBOUNCER', '0') == '1'
+
+    if url:
+        config = dj_database_url.parse(
+            url,
+            conn_max_age=conn_max_age,
+            conn_health_checks=True,
+            disable_server_side_cursors=pgbouncer,
+        )
+    else:
+        config = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'CONN_MAX_AGE': conn_max_age,
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': pgbouncer,
+            **fallback,
+        }
+
+    if config['ENGINE'] == 'django.db.backends.postgresql':
+        options = config.setdefault('OPTIONS', {})
+        options.setdefault('connect_timeout', env_int('DB_CONNECT_TIMEOUT', 5))
+        options.setdefault('application_name', os.environ.get('DB_APPLICATION_NAME', f'colace-{role}'))
+        if not pgbouncer:
+            # Sent as part of the startup packet, so it costs no extra round trip.
+            options['options'] = f'-c statement_timeout={statement_timeout_for(role)}'
+    return config
+
+
+def build_databases():
+    """
+    Returns (DATABASES, DATABASE_REPLICAS) for settings.py.
+    """
+    legacy = {
+        'NAME': os.environ.get('DB_NAME'),
+        'USER': os.environ.get('DB_USER'),
+        'PASSWORD': os.environ.get('DB_PASSWORD'),
+        'HOST': os.environ.get('DB_HOST'),
+        'PORT': os.environ.get('DB_PORT'),
+    }
+    databases = {'default': database_config(os.environ.get('DATABASE_URL'), 'primary', **legacy)}
+
+    replica_urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    replica_hosts = [host.strip() for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+
+    replicas = []
+    for url in replica_urls:
+        replicas.append(database_config(url, 'replica'))
+    for host in replica_hosts:
+        config = database_config(None, 'replica', **legacy)
+        if os.environ.get('DATABASE_URL'):
+            # Same credentials as the primary, different host.
+            primary = databases['default']
+            config.update({key: primary[key] for key in ('ENGINE', 'NAME', 'USER', 'PASSWORD', 'PORT')})
+        config['HOST'] = host
+        replicas.append(config)
+
+    aliases = []
+    for index, config in enumerate(replicas, start=1):
+        alias = f'replica{index}'
+        config['TEST'] = {'MIRROR': 'default'}
+        databases[alias] = config
+        aliases.append(alias)
+    return databases, aliases
+
+
+class statement_timeout:
+    """
+    Context manager lowering the statement timeout for the queries inside it,
+    e.g. around user search. Only affects PostgreSQL; wraps the block in a
+    transaction so `SET LOCAL` is undone when it exits.
+    """
+    def __init__(self, milliseconds, using='default'):
+        self.milliseconds = int(milliseconds)
+        self.using = using
+
+    def __enter__(self):
+        from django.db import connections, transaction
+
+        self.atomic = transaction.atomic(using=self.using)
+        self.atomic.__enter__()
+        connection = connections[self.using]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [self.milliseconds])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.atomic.__exit__(exc_type, exc_value, traceback)
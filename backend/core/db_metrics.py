@@ -0,0 +1,144 @@
+# backend/core/db_metrics.py
+
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_lock = threading.Lock()
+_stats = {
+    'connections_opened': 0,
+    'requests': 0,
+    'requests_reusing_connection': 0,
+    'in_flight': 0,
+    'peak_in_flight': 0,
+    'saturated_requests': 0,
+    'queries': 0,
+    'query_time_ms': 0.0,
+    'avg_query_ms': 0.0,
+    'last_query_at': 0.0,
+    'shed_requests': 0,
+}
+
+# Weight of the newest sample in the moving average of query latency.
+EWMA_ALPHA = 0.1
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    with _lock:
+        _stats['connections_opened'] += 1
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='core.db_metrics.connection_created')
+
+
+def record_query(duration_ms):
+    with _lock:
+        _stats['queries'] += 1
+        _stats['query_time_ms'] += duration_ms
+        _stats['last_query_at'] = time.monotonic()
+        if _stats['avg_query_ms']:
+            _stats['avg_query_ms'] += EWMA_ALPHA * (duration_ms - _stats['avg_query_ms'])
+        else:
+            _stats['avg_query_ms'] = duration_ms
+
+
+def snapshot():
+    """
+    Per-process connection stats. `saturation` is the share of the pool
+    (DB_POOL_SIZE connections) held by requests right now; at 1.0 new
+    requests queue up in the server waiting for a thread.
+    """
+    pool_size = max(getattr(settings, 'DB_POOL_SIZE', 1), 1)
+    with _lock:
+        stats = dict(_stats)
+    stats['pool_size'] = pool_size
+    stats['saturation'] = round(stats['in_flight'] / pool_size, 3)
+    stats['peak_saturation'] = round(stats['peak_in_flight'] / pool_size, 3)
+    return stats
+
+
+def _timed_execute(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_query((time.perf_counter() - start) * 1000)
+
+
+class DatabaseMetricsMiddleware:
+    """
+    Tracks how many requests hold database connections at once, how often
+    a persistent connection is reused instead of reopened, and query latency.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pool_size = max(getattr(settings, 'DB_POOL_SIZE', 1), 1)
+        reusing = connections['default'].connection is not None
+
+        with _lock:
+            _stats['requests'] += 1
+            _stats['in_flight'] += 1
+            _stats['peak_in_flight'] = max(_stats['peak_in_flight'], _stats['in_flight'])
+            if reusing:
+                _stats['requests_reusing_connection'] += 1
+            if _stats['in_flight'] >= pool_size:
+                _stats['saturated_requests'] += 1
+        try:
+            with ExitStack() as stack:
+                for alias in settings.DATABASES:
+                    stack.enter_context(connections[alias].execute_wrapper(_timed_execute))
+                return self.get_response(request)
+        finally:
+            with _lock:
+                _stats['in_flight'] -= 1
+
+
+def sheddable(view):
+    """
+    Marks a function view as safe to refuse with a 503 under load. Class
+    based views set `sheddable = True` instead.
+    """
+    view.sheddable = True
+    return view
+
+
+class LoadSheddingMiddleware:
+    """
+    Refuses requests to views marked `sheddable` (search, exports, ...)
+    with 503 + Retry-After while this process's average query latency is
+    above LOAD_SHED_DB_LATENCY_MS, so the database time goes to the
+    interactive endpoints. A latency reading older than
+    LOAD_SHED_STALE_SECONDS is ignored, otherwise shedding every request
+    would keep the average from ever coming back down.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        threshold = settings.LOAD_SHED_DB_LATENCY_MS
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        if not threshold or not getattr(view_class or view_func, 'sheddable', False):
+            return None
+
+        with _lock:
+            overloaded = (
+                _stats['avg_query_ms'] > threshold
+                and time.monotonic() - _stats['last_query_at'] < settings.LOAD_SHED_STALE_SECONDS
+            )
+            if overloaded:
+                _stats['shed_requests'] += 1
+        if not overloaded:
+            return None
+        response = JsonResponse({'detail': 'The server is busy, please try again shortly.'}, status=503)
+        response['Retry-After'] = str(settings.LOAD_SHED_RETRY_AFTER)
+        return response
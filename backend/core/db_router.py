@@ -0,0 +1,270 @@
+# backend/core/db_router.py
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DatabaseError, OperationalError, connections, transaction
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+
+# Always read from the primary: a session or permission read from a lagging
+# replica right after login or an admin edit would look logged out or stale.
+PRIMARY_ONLY_APPS = {'sessions', 'auth'}
+
+# True while the current request must read from the primary.
+_use_primary = ContextVar('use_primary', default=False)
+
+# alias -> monotonic time until which the replica is skipped (per process)
+_unhealthy_until = {}
+_last_health_check = 0.0
+_health_check_lock = threading.Lock()
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def healthy_replicas():
+    now = time.monotonic()
+    return [alias for alias in get_replicas() if _unhealthy_until.get(alias, 0) <= now]
+
+
+def mark_unhealthy(alias, cooldown=None):
+    """
+    Takes a replica out of rotation for `cooldown` seconds.
+    """
+    if cooldown is None:
+        cooldown = getattr(settings, 'REPLICA_UNHEALTHY_COOLDOWN', 30)
+    _unhealthy_until[alias] = time.monotonic() + cooldown
+
+
+def mark_healthy(alias):
+    _unhealthy_until.pop(alias, None)
+
+
+@contextmanager
+def use_primary():
+    """
+    Sends every read inside the block to the primary. Also works as a
+    decorator, e.g. on management commands that read rows and then update
+    them, where replica lag would make them act on stale data.
+    """
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+def replica_lag(alias):
+    """
+    Seconds the replica is behind the primary. Only PostgreSQL streaming
+    replicas can report this; other backends are assumed to be in sync.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    timeout = getattr(settings, 'REPLICA_HEALTH_CHECK_TIMEOUT_MS', 1000)
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        # A replica stuck replaying WAL shouldn't hang the probe for the
+        # whole statement_timeout.
+        cursor.execute('SET LOCAL statement_timeout = %s', [int(timeout)])
+        cursor.execute(
+            "SELECT CASE WHEN pg_is_in_recovery() "
+            "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+            "ELSE 0 END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def check_replicas():
+    """
+    Probes every replica and takes the ones that are unreachable or lagging
+    more than REPLICA_MAX_LAG_SECONDS out of rotation.
+    Returns {alias: lag in seconds or None when unreachable}.
+    """
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5)
+    status = {}
+    for alias in get_replicas():
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            lag = None
+        status[alias] = lag
+        if lag is None or lag > max_lag:
+            mark_unhealthy(alias)
+        else:
+            mark_healthy(alias)
+    return status
+
+
+def _check_replicas_in_background():
+    try:
+        check_replicas()
+    except Exception:
+        logger.exception('Replica health check failed')
+    finally:
+        # The probe opened its own connections in this thread.
+        connections.close_all()
+        _health_check_lock.release()
+
+
+def maybe_check_replicas():
+    """
+    Starts check_replicas() in a background thread at most once every
+    REPLICA_HEALTH_CHECK_INTERVAL seconds in this process, so a slow or
+    unreachable replica never delays the request that triggered it.
+    """
+    global _last_health_check
+    interval = getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 15)
+    now = time.monotonic()
+    if not get_replicas() or now - _last_health_check < interval:
+        return
+    if not _health_check_lock.acquire(blocking=False):
+        # The previous probe is still running.
+        return
+    _last_health_check = now
+    threading.Thread(target=_check_replicas_in_background, name='replica-health-check', daemon=True).start()
+
+
+def _sticky_key(user_id):
+    return f'db-sticky:{user_id}'
+
+
+def pin_user_to_primary(user_id):
+    """
+    Sends this user's reads to the primary for REPLICA_STICKY_SECONDS, long
+    enough for the replicas to catch up with what they just wrote.
+    """
+    cache.set(_sticky_key(user_id), True, getattr(settings, 'REPLICA_STICKY_SECONDS', 10))
+
+
+def is_user_pinned(user_id):
+    return bool(cache.get(_sticky_key(user_id)))
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends writes to the primary and spreads reads over the healthy replicas
+    listed in DATABASE_REPLICAS, unless the current request is pinned to
+    the primary (see ReplicaRoutingMiddleware).
+    """
+    def db_for_read(self, model, **hints):
+        if _use_primary.get() or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return PRIMARY
+        replicas = healthy_replicas()
+        if not replicas:
+            return PRIMARY
+        # Stay on the replica a transaction (e.g. statement_timeout) was opened on.
+        for connection in connections.all(initialized_only=True):
+            if connection.alias in replicas and connection.in_atomic_block:
+                return connection.alias
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Decides per request whether reads may go to a replica.
+
+    Unsafe methods always use the primary. After a successful write the
+    user is pinned to the primary for a short sticky window, so they see
+    their own post or comment even while the replicas lag behind. A safe
+    request whose replica drops mid-request is retried on the primary.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.jwt = JWTAuthentication()
+
+    def __call__(self, request):
+        maybe_check_replicas()
+
+        user_id = self._token_user_id(request)
+        if user_id is None:
+            user_id = self._session_user_id(request)
+        is_write = request.method not in SAFE_METHODS
+        use_primary = is_write or (user_id is not None and is_user_pinned(user_id))
+
+        token = _use_primary.set(use_primary)
+        try:
+            response = self.get_response(request)
+
+            if is_write and response.status_code < 400:
+                # DRF stores the authenticated user back on the request.
+                user = getattr(request, 'user', None)
+                if user is not None and user.is_authenticated:
+                    user_id = user.pk
+                if user_id is not None:
+                    pin_user_to_primary(user_id)
+        finally:
+            _use_primary.reset(token)
+        return response
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, OperationalError) or _use_primary.get():
+            return None
+        if request.method not in SAFE_METHODS:
+            return None
+        failed = [
+            connection.alias for connection in connections.all(initialized_only=True)
+            if connection.alias in get_replicas()
+        ]
+        if not failed:
+            return None
+        for alias in failed:
+            logger.warning('Replica %s failed mid-request, retrying on the primary', alias)
+            mark_unhealthy(alias)
+            connections[alias].close()
+
+        callback, args, kwargs = request.resolver_match
+        with use_primary():
+            return callback(request, *args, **kwargs)
+
+    def _token_user_id(self, request):
+        """
+        User id from the JWT, read without touching the database.
+        """
+        header = self.jwt.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.jwt.get_raw_token(header)
+        if raw_token is None:
+            return None
+        try:
+            validated_token = self.jwt.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return validated_token.get(jwt_settings.USER_ID_CLAIM)
+
+    def _session_user_id(self, request):
+        """
+        User id of a session login (the admin). Only looked up when the
+        request carries a session cookie, sessions are read from the primary.
+        """
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES or not hasattr(request, 'session'):
+            return None
+        return request.session.get(SESSION_KEY)
@@ -0,0 +1,85 @@
+# backend/core/deletion.py
+"""
+Deferred deletion for users, groups and posts.
+
+Deleting one of these only stamps `deletion_requested_at` on that one row,
+a single UPDATE however large the account or group is. The default managers
+stop returning it straight away by checking that column alone, no joins.
+What hangs off it (a user's groups, posts, comments and follows, a group's
+posts, a post's comments...) is stamped in small batches by the
+purge_deleted command, which then removes everything (see core/purge.py),
+so until its next run those rows are still visible. Large accounts or
+groups therefore never go through Django's in-memory cascade collector, or
+one long UPDATE, in a single request.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class VisibleManagerMixin:
+    """
+    Manager mixin hiding rows for which `model.visible_q()` is false, i.e.
+    rows pending deletion.
+    `_base_manager` still sees everything, which is what the purge uses.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Historical models in migrations don't carry visible_q()
+        visible_q = getattr(self.model, 'visible_q', None)
+        return queryset.filter(visible_q()) if visible_q else queryset
+
+
+class PendingDeleteQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        Marks every row as pending deletion instead of deleting it.
+        """
+        count = self.update(deletion_requested_at=timezone.now())
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class PendingDeleteManager(VisibleManagerMixin, models.Manager.from_queryset(PendingDeleteQuerySet)):
+    pass
+
+
+class PendingDeleteModel(models.Model):
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def visible_q(cls):
+        return models.Q(deletion_requested_at__isnull=True)
+
+    @property
+    def is_pending_deletion(self):
+        return self.deletion_requested_at is not None
+
+    def request_deletion(self):
+        """
+        Hides the object right away; purge_deleted removes it for real.
+        """
+        self.deletion_requested_at = timezone.now()
+        type(self)._base_manager.filter(pk=self.pk).update(deletion_requested_at=self.deletion_requested_at)
+
+    def delete(self, using=None, keep_parents=False):
+        self.request_deletion()
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        return super().delete(using=using, keep_parents=keep_parents)
+
+
+def pending_index(name):
+    """
+    Partial index over the (few) rows waiting to be purged.
+    """
+    return models.Index(
+        fields=['deletion_requested_at'],
+        condition=models.Q(deletion_requested_at__isnull=False),
+        name=name,
+    )
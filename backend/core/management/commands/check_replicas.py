@@ -0,0 +1,21 @@
+# backend/core/management/commands/check_replicas.py
+
+from django.core.management.base import BaseCommand
+
+from core.db_router import check_replicas
+
+
+class Command(BaseCommand):
+    help = "Reports reachability and replication lag of every configured read replica."
+
+    def handle(self, *args, **options):
+        status = check_replicas()
+        if not status:
+            self.stdout.write("No read replicas configured.")
+            return
+
+        for alias, lag in status.items():
+            if lag is None:
+                self.stdout.write(self.style.ERROR(f"{alias}: unreachable"))
+            else:
+                self.stdout.write(f"{alias}: {lag:.2f}s behind the primary")
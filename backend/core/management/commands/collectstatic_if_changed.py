@@ -0,0 +1,49 @@
+# backend/core/management/commands/collectstatic_if_changed.py
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+STAMP_NAME = '.collectstatic-hash'
+
+
+def static_sources_hash():
+    """
+    Hash over the path, size and mtime of every file collectstatic would
+    copy, without reading the files themselves.
+    """
+    digest = hashlib.sha256()
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list(['CVS', '.*', '*~']):
+            stat = os.stat(storage.path(path))
+            entries.append(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}')
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = "Runs collectstatic only when the static source files changed since the last run."
+
+    def handle(self, *args, **options):
+        stamp_path = os.path.join(settings.STATIC_ROOT, STAMP_NAME)
+        current = static_sources_hash()
+        try:
+            with open(stamp_path) as stamp:
+                previous = stamp.read().strip()
+        except FileNotFoundError:
+            previous = None
+
+        if previous == current:
+            self.stdout.write("Static files unchanged, skipping collectstatic.")
+            return
+
+        call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
+        with open(stamp_path, 'w') as stamp:
+            stamp.write(current)
@@ -0,0 +1,40 @@
+# backend/core/management/commands/migrate_locked.py
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+# Arbitrary, shared by every container of this app
+MIGRATION_LOCK_ID = 0x636f6c616365
+
+
+class Command(BaseCommand):
+    help = (
+        "Applies pending migrations and creates the coming months' post partitions while holding "
+        "a PostgreSQL advisory lock, so containers starting together run them one at a time and "
+        "the rest find nothing left to do."
+    )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        # Session-level lock: behind PgBouncer in transaction mode it isn't held
+        # across statements, run this as a one-off release step there instead.
+        locking = connection.vendor == 'postgresql'
+        if locking:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_lock(%s)', [MIGRATION_LOCK_ID])
+        try:
+            # Planned after taking the lock, whatever ran while we waited is already applied
+            executor = MigrationExecutor(connection)
+            plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+            if plan:
+                call_command('migrate', interactive=False, verbosity=options['verbosity'])
+            else:
+                self.stdout.write("No unapplied migrations.")
+            # Also a deploy step: new posts must never pile up in the DEFAULT partition.
+            call_command('ensure_post_partitions', stdout=self.stdout, verbosity=options['verbosity'])
+        finally:
+            if locking:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [MIGRATION_LOCK_ID])
@@ -0,0 +1,68 @@
+# backend/core/management/commands/profile_imports.py
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a worker imports before it can answer its first request: the WSGI
+# app (settings, apps, models) plus the URLconf, which pulls in every view.
+BOOT_CODE = 'import core.wsgi; from django.urls import get_resolver; get_resolver().url_patterns'
+
+
+def parse_importtime(output):
+    """
+    Parses `python -X importtime` output into [(module, self_us, cumulative_us, depth)].
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots the app in a fresh interpreter under `python -X importtime` and reports what each "
+        "module and package costs at startup. --budget-ms makes it fail when startup gets slower."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help="How many modules to list")
+        parser.add_argument('--sort', choices=['self', 'cumulative'], default='cumulative')
+        parser.add_argument('--budget-ms', type=float, help="Exit with an error if importing takes longer than this")
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+            cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Booting the app failed:\n{result.stderr[-2000:]}")
+
+        rows = parse_importtime(result.stderr)
+        total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+
+        column = 1 if options['sort'] == 'self' else 2
+        self.stdout.write(f"{'self ms':>9} {'cumul ms':>9}  module")
+        for name, self_us, cumulative_us, depth in sorted(rows, key=lambda row: -row[column])[:options['top']]:
+            self.stdout.write(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+        # Per top-level package, e.g. everything under rest_framework.*
+        packages = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            packages[name.split('.', 1)[0]] += self_us
+        self.stdout.write(f"\n{'ms':>9}  package")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{self_us / 1000:9.1f}  {package}")
+
+        self.stdout.write(f"\n{len(rows)} modules imported in {total_ms:.1f} ms")
+        budget = options['budget_ms']
+        if budget is not None and total_ms > budget:
+            raise CommandError(f"Startup imports took {total_ms:.1f} ms, over the {budget:.0f} ms budget.")
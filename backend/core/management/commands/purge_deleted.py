@@ -0,0 +1,30 @@
+# backend/core/management/commands/purge_deleted.py
+
+from django.core.management.base import BaseCommand
+
+from core.db_router import use_primary
+from core.purge import hide_dependents, purge_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Hides the posts, comments, groups and follows of users, groups and posts marked for "
+        "deletion, then permanently removes all of them, in small batches. Until it runs, only "
+        "the deleted object itself is hidden, so schedule it every few minutes (or --hide-only "
+        "that often and the full purge less often)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--hide-only', action='store_true', help="Hide dependents (and drop pending users' follows) without purging anything.")
+
+    @use_primary()
+    def handle(self, *args, **options):
+        if options['hide_only']:
+            hide_dependents(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS("Hid the dependents of everything pending deletion."))
+            return
+        counts = purge_pending(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Purged {posts} posts, {groups} groups and {users} users.".format(**counts)
+        ))
@@ -0,0 +1,107 @@
+# backend/core/middleware.py
+
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # whitenoise[brotli] normally pulls this in
+    brotli = None
+
+re_accepts_br = re.compile(r'\bbr\b')
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+# Only text-like payloads are worth compressing; images and other media are
+# already compressed and would just burn CPU.
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/',
+)
+
+
+class APICompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip compression for API responses (paths under
+    API_COMPRESSION_PATH_PREFIX, '/api/' by default).
+
+    Whitenoise only compresses static files, so JSON from the API used to go
+    out uncompressed. Brotli is preferred when the client offers it, gzip
+    otherwise. Responses smaller than API_COMPRESSION_MIN_SIZE bytes are left
+    alone since the framing overhead isn't worth it.
+    """
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        # Static files are precompressed by whitenoise, pages and media are left alone
+        if not request.path_info.startswith(getattr(settings, 'API_COMPRESSION_PATH_PREFIX', '/api/')):
+            return response
+
+        min_size = getattr(settings, 'API_COMPRESSION_MIN_SIZE', 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return response
+
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and re_accepts_br.search(accept_encoding):
+            encoding = 'br'
+        elif re_accepts_gzip.search(accept_encoding):
+            encoding = 'gzip'
+        else:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            if encoding == 'br':
+                response.streaming_content = self._brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content,
+                    max_random_bytes=self.max_random_bytes,
+                )
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                quality = getattr(settings, 'API_COMPRESSION_BROTLI_QUALITY', 4)
+                compressed_content = brotli.compress(response.content, quality=quality)
+            else:
+                compressed_content = compress_string(
+                    response.content,
+                    max_random_bytes=self.max_random_bytes,
+                )
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # A strong ETag no longer matches the bytes on the wire.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+        return response
+
+    @staticmethod
+    def _brotli_sequence(sequence):
+        quality = getattr(settings, 'API_COMPRESSION_BROTLI_QUALITY', 4)
+        compressor = brotli.Compressor(quality=quality)
+        for chunk in sequence:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
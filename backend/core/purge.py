@@ -0,0 +1,188 @@
+# backend/core/purge.py
+"""
+Removes users, groups and posts marked for deletion (see core/deletion.py),
+dependents first, in batches of `batch_size` rows. Each batch is its own
+short transaction, so memory use and lock time don't grow with the size of
+the account or group being removed.
+
+A deletion request only stamps the root row, so each run first hides what
+hangs off every pending root (hide_dependents), then purges.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from groups.models import Group
+from notifications.models import Notification
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+from relationships.models import Follow, UserSuggestions
+
+User = get_user_model()
+Membership = Group.members.through
+
+
+def _id_batches(queryset, batch_size):
+    """
+    Yields lists of primary keys from `queryset` until it is empty. Callers
+    delete each batch, so we always read from the start.
+    """
+    ids = queryset.order_by().values_list('pk', flat=True)
+    while True:
+        batch = list(ids[:batch_size])
+        if not batch:
+            return
+        yield batch
+
+
+def delete_in_batches(queryset, batch_size):
+    model = queryset.model
+    total = 0
+    for ids in _id_batches(queryset, batch_size):
+        with transaction.atomic():
+            model._base_manager.filter(pk__in=ids).delete()
+        total += len(ids)
+    return total
+
+
+def purge_posts(posts, batch_size):
+    """
+    Deletes `posts` (a queryset) with their comments and notifications.
+    """
+    total = 0
+    for ids in _id_batches(posts, batch_size):
+        delete_in_batches(Notification.objects.filter(post_id__in=ids), batch_size)
+        delete_in_batches(Comment._base_manager.filter(post_id__in=ids), batch_size)
+        with transaction.atomic():
+            Post._base_manager.filter(pk__in=ids).delete()
+        total += len(ids)
+    return total
+
+
+def purge_archived_posts(posts, batch_size):
+    """
+    Deletes archived `posts` with their comments, archived or not.
+    """
+    total = 0
+    for ids in _id_batches(posts, batch_size):
+        delete_in_batches(Notification.objects.filter(post_id__in=ids), batch_size)
+        delete_in_batches(Comment._base_manager.filter(post_id__in=ids), batch_size)
+        delete_in_batches(ArchivedComment.objects.filter(post_id__in=ids), batch_size)
+        with transaction.atomic():
+            ArchivedPost.objects.filter(pk__in=ids).delete()
+        total += len(ids)
+    return total
+
+
+def purge_group(group, batch_size):
+    purge_posts(Post._base_manager.filter(group=group), batch_size)
+    purge_archived_posts(ArchivedPost.objects.filter(group=group.pk), batch_size)
+    delete_in_batches(Notification.objects.filter(group=group), batch_size)
+
+    members = Membership.objects.filter(group=group)
+    UserSuggestions.objects.filter(user__in=members.values('user_id')).update(is_stale=True)
+    delete_in_batches(members, batch_size)
+
+    group.hard_delete()
+
+
+def _delete_follows(follows, counter_side, counter_field, batch_size):
+    """
+    Deletes Follow rows and decrements `counter_field` on the users on
+    `counter_side` of each row.
+    """
+    for ids in _id_batches(follows, batch_size):
+        with transaction.atomic():
+            affected = list(Follow._base_manager.filter(pk__in=ids).values_list(f'{counter_side}_id', flat=True))
+            User._base_manager.filter(pk__in=affected, **{f'{counter_field}__gt': 0}).update(
+                **{counter_field: F(counter_field) - 1}
+            )
+            Follow._base_manager.filter(pk__in=ids).delete()
+
+
+def purge_user(user, batch_size):
+    for group in Group._base_manager.filter(owner=user):
+        purge_group(group, batch_size)
+
+    purge_posts(Post._base_manager.filter(author=user), batch_size)
+    delete_in_batches(Comment._base_manager.filter(author=user), batch_size)
+    purge_archived_posts(ArchivedPost.objects.filter(author=user.pk), batch_size)
+    delete_in_batches(ArchivedComment.objects.filter(author=user.pk), batch_size)
+
+    delete_in_batches(Notification.objects.filter(recipient=user), batch_size)
+    for ids in _id_batches(Notification.objects.filter(last_actor=user), batch_size):
+        Notification.objects.filter(pk__in=ids).update(last_actor=None)
+
+    _delete_follows(Follow._base_manager.filter(follower=user), 'following', 'followers_count', batch_size)
+    _delete_follows(Follow._base_manager.filter(following=user), 'follower', 'following_count', batch_size)
+    delete_in_batches(Membership.objects.filter(user=user), batch_size)
+
+    user.hard_delete()
+
+
+def stamp_in_batches(queryset, when, batch_size):
+    """
+    Stamps the rows of `queryset` not yet pending deletion, one short
+    UPDATE per batch.
+    """
+    model = queryset.model
+    total = 0
+    for ids in _id_batches(queryset.filter(deletion_requested_at__isnull=True), batch_size):
+        model._base_manager.filter(pk__in=ids).update(deletion_requested_at=when)
+        total += len(ids)
+    return total
+
+
+def hide_dependents(batch_size):
+    """
+    Stamps what hangs off each pending user, group and post so the default
+    managers stop returning it, and deletes pending users' follows (with
+    their counters). Nothing is read through a join to the pending root.
+    """
+    for user in User._base_manager.filter(deletion_requested_at__isnull=False).iterator(chunk_size=100):
+        when = user.deletion_requested_at
+        # Groups go with their owner.
+        stamp_in_batches(Group._base_manager.filter(owner=user), when, batch_size)
+        stamp_in_batches(Post._base_manager.filter(author=user), when, batch_size)
+        stamp_in_batches(ArchivedPost.objects.filter(author=user.pk), when, batch_size)
+        stamp_in_batches(Comment._base_manager.filter(author=user), when, batch_size)
+        stamp_in_batches(ArchivedComment.objects.filter(author=user.pk), when, batch_size)
+        _delete_follows(Follow._base_manager.filter(follower=user), 'following', 'followers_count', batch_size)
+        _delete_follows(Follow._base_manager.filter(following=user), 'follower', 'following_count', batch_size)
+
+    for group in Group._base_manager.filter(deletion_requested_at__isnull=False).iterator(chunk_size=100):
+        when = group.deletion_requested_at
+        stamp_in_batches(Post._base_manager.filter(group=group), when, batch_size)
+        stamp_in_batches(ArchivedPost.objects.filter(group=group.pk), when, batch_size)
+
+    # A post's comments can be live or archived, whichever table the post is in.
+    now = timezone.now()
+    for post_model in (Post, ArchivedPost):
+        pending_posts = post_model._base_manager.filter(deletion_requested_at__isnull=False).values('pk')
+        for comment_model in (Comment, ArchivedComment):
+            stamp_in_batches(comment_model._base_manager.filter(post_id__in=pending_posts), now, batch_size)
+
+
+def purge_pending(batch_size=500):
+    """
+    Purges everything currently marked for deletion.
+    Returns {'posts': n, 'groups': n, 'users': n}.
+    """
+    hide_dependents(batch_size)
+
+    counts = {}
+    counts['posts'] = purge_posts(Post._base_manager.filter(deletion_requested_at__isnull=False), batch_size)
+    counts['posts'] += purge_archived_posts(ArchivedPost.objects.filter(deletion_requested_at__isnull=False), batch_size)
+
+    groups = Group._base_manager.filter(deletion_requested_at__isnull=False)
+    counts['groups'] = 0
+    for group in groups.iterator(chunk_size=100):
+        purge_group(group, batch_size)
+        counts['groups'] += 1
+
+    users = User._base_manager.filter(deletion_requested_at__isnull=False)
+    counts['users'] = 0
+    for user in users.iterator(chunk_size=100):
+        purge_user(user, batch_size)
+        counts['users'] += 1
+    return counts
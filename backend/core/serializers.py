@@ -0,0 +1,46 @@
+# backend/core/serializers.py
+
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+
+class PendingAwareUniqueValidator(UniqueValidator):
+    """
+    UniqueValidator that also checks rows pending deletion: they keep their
+    username, email or name until purge_deleted removes them, so checking
+    only the visible rows would end in an IntegrityError.
+    """
+    pending_message = 'This {field_name} belongs to {model_name} that is being deleted. It can be used again once the deletion is complete.'
+
+    def __init__(self, queryset, **kwargs):
+        super().__init__(queryset=queryset.model._base_manager.all(), **kwargs)
+
+    def __call__(self, value, serializer_field):
+        try:
+            super().__call__(value, serializer_field)
+        except serializers.ValidationError:
+            field_name = serializer_field.source_attrs[-1]
+            queryset = self.filter_queryset(value, self.queryset, field_name)
+            if queryset.filter(deletion_requested_at__isnull=False).exists():
+                model_name = f'a {queryset.model._meta.verbose_name}'
+                raise serializers.ValidationError(
+                    self.pending_message.format(field_name=field_name, model_name=model_name), code='unique',
+                )
+            raise
+
+
+class PendingAwareUniqueMixin:
+    """
+    ModelSerializer mixin swapping the generated UniqueValidators for
+    PendingAwareUniqueValidator. For models with deferred deletion, see
+    core/deletion.py.
+    """
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+        if 'validators' in field_kwargs:
+            field_kwargs['validators'] = [
+                PendingAwareUniqueValidator(validator.queryset, message=validator.message, lookup=validator.lookup)
+                if type(validator) is UniqueValidator else validator
+                for validator in field_kwargs['validators']
+            ]
+        return field_class, field_kwargs
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 from datetime import timedelta
 from pathlib import Path
 import os
+
+from core.database import build_databases
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,20 +44,26 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt', # Add this for Simple JWT
     'djoser',
     'corsheaders',
+    'core',
     'users',
     'posts',
     'relationships',
     'groups',
+    'notifications',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', # Add this line
+    'core.middleware.APICompressionMiddleware', # brotli/gzip for API responses
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', # Add this
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware', # primary vs replica reads
+    'core.db_metrics.DatabaseMetricsMiddleware', # connection/pool saturation stats
+    'core.db_metrics.LoadSheddingMiddleware', # 503 for `sheddable` views when the DB is slow
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -99,16 +107,51 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
+# Built from DATABASE_URL / DB_* env vars with persistent, health-checked
+# connections and per-role statement timeouts, see core/database.py
+DATABASES, DATABASE_REPLICAS = build_databases()
+
+# Safe-method requests read from a healthy replica, see core/db_router.py
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10)) # reads-after-writes window
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 5))
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.environ.get('REPLICA_HEALTH_CHECK_INTERVAL', 15))
+REPLICA_UNHEALTHY_COOLDOWN = float(os.environ.get('REPLICA_UNHEALTHY_COOLDOWN', 30))
+REPLICA_HEALTH_CHECK_TIMEOUT_MS = int(os.environ.get('REPLICA_HEALTH_CHECK_TIMEOUT_MS', 1000))
+
+# Requests one worker process can run at once, gunicorn.conf.py reads it from here
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+# Each thread holds at most one persistent connection per database
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', GUNICORN_THREADS))
+# Cap on user search queries so they give up long before the role timeout
+SEARCH_STATEMENT_TIMEOUT_MS = int(os.environ.get('SEARCH_STATEMENT_TIMEOUT_MS', 2000))
+
+# Most users a single relationships/status/ lookup may ask about
+RELATIONSHIP_STATUS_MAX_USERS = 300
+
+# Notifications are buffered in each worker and written in bulk every
+# NOTIFICATIONS_FLUSH_INTERVAL seconds (or once NOTIFICATIONS_BATCH_SIZE pile up).
+# Set NOTIFICATIONS_ASYNC=0 to write them right after the request's transaction.
+NOTIFICATIONS_ASYNC = os.environ.get('NOTIFICATIONS_ASYNC', '1') == '1'
+NOTIFICATIONS_FLUSH_INTERVAL = float(os.environ.get('NOTIFICATIONS_FLUSH_INTERVAL', 2))
+NOTIFICATIONS_BATCH_SIZE = 500
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
+
+# Posts and comments are partitioned by month on PostgreSQL (posts/partitioning.py).
+# Partitions are created POST_PARTITIONS_AHEAD months in advance and moved to
+# the archive tables once older than POSTS_ARCHIVE_AFTER_MONTHS.
+POST_PARTITIONS_AHEAD = int(os.environ.get('POST_PARTITIONS_AHEAD', 3))
+POSTS_ARCHIVE_AFTER_MONTHS = int(os.environ.get('POSTS_ARCHIVE_AFTER_MONTHS', 12))
+
+# Shared cache, used for the replica sticky window among other things.
+# Without REDIS_URL every worker process gets its own in-memory cache.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
     }
-}
 
 
 # Password validation
@@ -150,8 +193,16 @@ STATIC_URL = 'static/'
 # This is the directory where Django will collect all static files
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# Enable Whitenoise to serve static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    # Uploads are stored under their content hash, identical files are kept once
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    # Enable Whitenoise to serve static files
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -165,7 +216,38 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    # orjson-backed JSON; keep the browsable API and form/multipart uploads
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Budgets for core.throttling's token buckets, "<view throttle_scope>_<key>"
+    'DEFAULT_THROTTLE_RATES': {
+        'register_ip': '5/hour',
+        'register_domain': '200/hour',
+        'login_ip': '20/min',
+        'search_user': '60/min',
+    },
+    # Proxies in front of the app (e.g. 1 behind the platform's load balancer),
+    # so throttles key on the real client address from X-Forwarded-For
+    'NUM_PROXIES': int(os.environ['NUM_PROXIES']) if os.environ.get('NUM_PROXIES') else None,
 }
+# Views marked `sheddable` answer 503 while the average query takes longer
+# than this (ms, per worker process, see core/db_metrics.py). 0 disables.
+LOAD_SHED_DB_LATENCY_MS = float(os.environ.get('LOAD_SHED_DB_LATENCY_MS', 250))
+LOAD_SHED_STALE_SECONDS = 5
+LOAD_SHED_RETRY_AFTER = 5
+
+# Only responses under this path are compressed by APICompressionMiddleware
+API_COMPRESSION_PATH_PREFIX = '/api/'
+# Responses smaller than this (bytes) are sent uncompressed
+API_COMPRESSION_MIN_SIZE = int(os.environ.get('API_COMPRESSION_MIN_SIZE', 1024))
+API_COMPRESSION_BROTLI_QUALITY = int(os.environ.get('API_COMPRESSION_BROTLI_QUALITY', 4))
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
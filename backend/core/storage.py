@@ -0,0 +1,42 @@
+# backend/core/storage.py
+
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that names every file after the SHA-256 of its contents.
+
+    Uploading the same bytes twice (the same photo set as an avatar by
+    several accounts, a re-uploaded image...) stores them once: the second
+    save just returns the existing name. Since a name can only ever hold one
+    content, files can be served with far-future cache headers.
+
+    The upload directory and file extension of the requested name are kept,
+    only the base name is replaced. Because names may now be shared, only
+    delete a file once nothing references it anymore.
+    """
+    digest_length = 32
+
+    def _save(self, name, content):
+        hasher = hashlib.sha256()
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        content.seek(0)
+
+        directory, filename = os.path.split(name)
+        ext = os.path.splitext(filename)[1].lower()
+        target = os.path.join(directory, hasher.hexdigest()[:self.digest_length] + ext)
+
+        if self.exists(target):
+            return target
+
+        saved = super()._save(target, content)
+        if saved != target:
+            # Somebody else wrote the same content between the exists() check
+            # and our write; keep theirs and drop the suffixed duplicate.
+            super().delete(saved)
+        return target
@@ -0,0 +1,16 @@
+# backend/core/test_settings.py
+"""
+Settings for running the tests with a read replica:
+
+    python manage.py test --settings=core.test_settings
+
+Adds a `replica1` alias mirroring the test database, so the replica router
+and read-your-writes pinning are exercised over two real connections.
+Tests that need it are skipped under the plain settings.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, DATABASE_REPLICAS
+
+if not DATABASE_REPLICAS:
+    DATABASES['replica1'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS = ['replica1']
@@ -0,0 +1,115 @@
+# backend/core/throttling.py
+"""
+Token-bucket throttles for the expensive endpoints.
+
+Each throttle class keys its bucket differently (user, client IP, email
+domain). The budget comes from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+under "<view.throttle_scope>_<key type>", e.g. 'register_ip': '5/hour'.
+'N/period' means a burst of up to N requests, then one more every
+period/N. A view without a throttle_scope, or a scope without a rate, is
+not limited.
+
+Buckets live in the shared cache and are updated with atomic incr/decr only
+(GCRA: the key holds the bucket's "theoretical arrival time" in ms), so
+concurrent workers can't both spend the last token.
+"""
+import math
+import time
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def take_token(cache, key, capacity, period):
+    """
+    Takes one token from the bucket at `key`, which holds `capacity` tokens
+    and refills completely every `period` seconds.
+    Returns (allowed, seconds until a token is available).
+    """
+    interval = math.ceil(period * 1000 / capacity)
+    tolerance = interval * capacity
+    now = int(time.time() * 1000)
+
+    # A missing key is a full bucket. The key expires once the bucket has
+    # refilled, so we never need a non-atomic "reset to now".
+    cache.add(key, now, timeout=period + 1)
+    try:
+        tat = cache.incr(key, interval)
+    except ValueError:  # expired between add() and incr()
+        cache.add(key, now + interval, timeout=period + 1)
+        tat = now + interval
+    if tat - interval < now:
+        # GCRA counts from max(tat, now): a TAT left in the past (refilled
+        # but not expired yet) must not bank extra tokens. Concurrent
+        # requests may both add the gap, which only errs on the strict side.
+        tat = cache.incr(key, now - (tat - interval))
+
+    if tat - now > tolerance:
+        # Over budget: hand the token back so rejected requests cost nothing.
+        cache.decr(key, interval)
+        return False, (tat - tolerance - now) / 1000
+    cache.touch(key, timeout=math.ceil((tat - now) / 1000) + 1)
+    return True, None
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    scope_suffix = None
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def __init__(self):
+        # The scope depends on the view, so the rate is looked up in
+        # allow_request() (the same as DRF's ScopedRateThrottle).
+        self._wait = None
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, 'throttle_scope', None)
+        if not view_scope:
+            return True
+        self.scope = f'{view_scope}_{self.scope_suffix}'
+        self.rate = self.THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        ident = self.get_bucket_ident(request)
+        if ident is None:
+            return True
+        self.key = self.cache_format % {'scope': self.scope, 'ident': ident}
+        allowed, self._wait = take_token(self.cache, self.key, self.num_requests, self.duration)
+        return allowed
+
+    def get_bucket_ident(self, request):
+        raise NotImplementedError('.get_bucket_ident() must be overridden')
+
+    def wait(self):
+        return self._wait
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Per signed-in user, per client IP for anonymous requests."""
+    scope_suffix = 'user'
+
+    def get_bucket_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    scope_suffix = 'ip'
+
+    def get_bucket_ident(self, request):
+        return self.get_ident(request)
+
+
+class EmailDomainTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Per domain of the submitted `email`, so one campus (or one scripted
+    attacker rotating addresses on a domain) can't use up everyone's budget.
+    """
+    scope_suffix = 'domain'
+
+    def get_bucket_ident(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or '@' not in email:
+            return None
+        return email.rsplit('@', 1)[1].strip().lower() or None
@@ -1,9 +1,10 @@
 # backend/core/urls.py
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core.views import serve_media, DatabaseHealthView
 
 # Import your custom view
 from users.views import CustomTokenObtainPairView
@@ -17,6 +18,7 @@ urlpatterns = [
     path('api/', include('users.urls')), # Includes /register/, /register/verify/, /users/, /users/{username}/
     path('api/', include('relationships.urls')),
     path('api/', include('groups.urls')),
+    path('api/', include('notifications.urls')),
 
     # Djoser core URLs (for user management like /users/me/, password reset, etc.)
     path('api/auth/', include('djoser.urls')),
@@ -27,10 +29,15 @@ urlpatterns = [
     # Use standard Simple JWT view for refreshing the token
     path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
+    # Per-worker database connection metrics (staff only)
+    path('api/health/db/', DatabaseHealthView.as_view(), name='health-db'),
+
     # REMOVE Djoser's authtoken/jwt includes if they were present
     # path('api/auth/', include('djoser.urls.authtoken')), # Remove this
     # path('api/auth/', include('djoser.urls.jwt')), # Remove this
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Uploaded media, served in production too (range requests, ETags, sendfile)
+urlpatterns += [
+    re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
+]
\ No newline at end of file
@@ -0,0 +1,159 @@
+# backend/core/views.py
+
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+from rest_framework import views
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .db_metrics import snapshot
+
+# Stored media names are never reused (see core.storage), so a URL always
+# points at the same bytes and can be cached for a year.
+MEDIA_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+range_re = re.compile(r'^bytes=(\d*)-(\d*)$')
+content_hash_re = re.compile(r'^[0-9a-f]{32,64}$')
+
+
+class _FileRange:
+    """
+    File-like view of `length` bytes of `file` starting at its current
+    position. It exposes fileno() so gunicorn can still sendfile() the slice
+    straight from the page cache.
+    """
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    """
+    Returns (start, end) for a single 'bytes=' range, None when the header
+    should be ignored, or raises ValueError when it can't be satisfied.
+    """
+    match = range_re.match(header.strip())
+    if not match:
+        # Malformed or multi-range requests get the whole file.
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def _etag(full_path, file_stat):
+    """
+    Strong ETag for a media file. Content-addressed names already are a
+    hash of the bytes, so the same file gets the same tag on every server
+    and after a restore; other files fall back to mtime and size.
+    """
+    stem = os.path.splitext(os.path.basename(full_path))[0]
+    if content_hash_re.match(stem):
+        return f'"{stem}"'
+    return f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serves uploaded files from MEDIA_ROOT in production.
+
+    Supports conditional requests (If-None-Match), single byte ranges and
+    long-lived caching. Files are handed to the server as file objects so
+    they're streamed with sendfile() rather than read into memory.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('File not found.')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('File not found.')
+
+    size = file_stat.st_size
+    etag = _etag(full_path, file_stat)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    def cache_headers(response):
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(file_stat.st_mtime)
+        response.headers['Cache-Control'] = MEDIA_CACHE_CONTROL
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if '*' in etags or etag in etags or 'W/' + etag in etags:
+            return cache_headers(HttpResponseNotModified())
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{size}'
+            return cache_headers(response)
+
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        return cache_headers(FileResponse(file, content_type=content_type))
+
+    start, end = byte_range
+    file.seek(start)
+    response = FileResponse(_FileRange(file, end - start + 1), status=206, content_type=content_type)
+    response.headers['Content-Length'] = str(end - start + 1)
+    response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return cache_headers(response)
+
+
+class DatabaseHealthView(views.APIView):
+    """
+    Connection reuse, pool saturation and query latency of the worker
+    process that answers the request.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(snapshot())
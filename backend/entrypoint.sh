@@ -0,0 +1,14 @@
+#!/usr/bin/env bash
+# Production entrypoint: apply pending migrations and refresh static files
+# only when needed, then hand the process over to gunicorn.
+set -o errexit
+
+# migrate_locked serializes containers that start together. Set
+# RUN_MIGRATIONS=0 where migrations run as a separate release step.
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+    python manage.py migrate_locked
+fi
+
+python manage.py collectstatic_if_changed
+
+exec gunicorn core.wsgi:application --config gunicorn.conf.py
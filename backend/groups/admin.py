@@ -1,3 +1,14 @@
 from django.contrib import admin
+from core.admin import ScalableModelAdmin
+from .models import Group
 
-# Register your models here.
+
+@admin.register(Group)
+class GroupAdmin(ScalableModelAdmin):
+    list_display = ('name', 'owner', 'created_at', 'pending_deletion')
+    list_select_related = ('owner',)
+    search_fields = ('=name',)
+    # Search-as-you-type widgets instead of a <select> listing every user
+    autocomplete_fields = ('owner', 'members')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:10
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_deletion_requested_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='group_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['created_at'], name='group_created_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:14
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_college_domain(apps, schema_editor):
+    Group = apps.get_model('groups', 'Group')
+    User = apps.get_model('users', 'User')
+    owner_domain = User.objects.filter(pk=OuterRef('owner_id')).values('college_domain')[:1]
+    Group.objects.update(college_domain=Subquery(owner_domain))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0003_admin_indexes'),
+        ('users', '0006_college_domain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='college_domain',
+            field=models.CharField(blank=True, default='', max_length=253),
+        ),
+        migrations.RunPython(backfill_college_domain, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['college_domain', '-created_at'], name='group_college_created_idx'),
+        ),
+    ]
@@ -1,12 +1,32 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
+from core.deletion import PendingDeleteModel, PendingDeleteManager, pending_index
 
-class Group(models.Model):
+class Group(PendingDeleteModel):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='owned_groups')
     members = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='joined_groups', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # The owner's campus when the group was created, for group discovery
+    college_domain = models.CharField(max_length=253, blank=True, default='')
+
+    objects = PendingDeleteManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            pending_index('group_pending_delete_idx'),
+            models.Index(Upper('name'), name='group_name_upper_idx'),
+            models.Index(fields=['created_at'], name='group_created_idx'),
+            models.Index(fields=['college_domain', '-created_at'], name='group_college_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.college_domain and self.owner_id:
+            self.college_domain = self.owner.college_domain
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
\ No newline at end of file
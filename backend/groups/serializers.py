@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.serializers import PendingAwareUniqueMixin
 from .models import Group
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(PendingAwareUniqueMixin, serializers.ModelSerializer):
     owner_username = serializers.ReadOnlyField(source='owner.username')
     member_count = serializers.SerializerMethodField()
     is_member = serializers.SerializerMethodField() # Add this
@@ -9,8 +10,8 @@ class GroupSerializer(serializers.ModelSerializer):
     class Meta:
         model = Group
         # Add 'is_member' to the fields list
-        fields = ['id', 'name', 'description', 'owner', 'owner_username', 'members', 'member_count', 'is_member', 'created_at']
-        read_only_fields = ['owner', 'members']
+        fields = ['id', 'name', 'description', 'owner', 'owner_username', 'members', 'member_count', 'is_member', 'college_domain', 'created_at']
+        read_only_fields = ['owner', 'members', 'college_domain']
 
     def get_member_count(self, obj):
         return obj.members.count()
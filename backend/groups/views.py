@@ -3,6 +3,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+from notifications.buffer import notify
+from notifications.models import Notification
+from users.colleges import requested_college
 from .models import Group
 from .serializers import GroupSerializer
 from .permissions import IsOwnerOrReadOnly # Import the new permission
@@ -16,6 +19,14 @@ class GroupViewSet(viewsets.ModelViewSet):
     serializer_class = GroupSerializer
     permission_classes = [IsOwnerOrReadOnly] # Use the new permission
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Group discovery by campus: ?college=mine or ?college=<domain>
+        college = requested_college(self.request) if self.action == 'list' else None
+        if college is not None:
+            queryset = queryset.filter(college_domain=college).order_by('-created_at')
+        return queryset
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context.update({"request": self.request})
@@ -56,6 +67,7 @@ class GroupViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'User is already a member.'}, status=status.HTTP_400_BAD_REQUEST)
 
         group.members.add(user_to_add)
+        notify(user_to_add.pk, Notification.GROUP_ADD, request.user.pk, group_id=group.pk)
         return Response({'detail': f'{username} has been added to the group.'}, status=status.HTTP_200_OK)
     
 class UserGroupsView(generics.ListAPIView):
@@ -0,0 +1,48 @@
+# backend/gunicorn.conf.py
+"""
+Production server settings, every value can be overridden from the
+environment. Started by entrypoint.sh: gunicorn -c gunicorn.conf.py.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+from django.conf import settings  # noqa: E402
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Defined in settings, which also sizes DB_POOL_SIZE from it
+threads = settings.GUNICORN_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Import Django, settings, models and URLconf once in the master, then fork:
+# workers start warm and share those pages copy-on-write.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recycle workers now and then so slow leaks can't build up, staggered so they
+# don't all restart at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+# Worker heartbeat files on tmpfs: on a slow disk gunicorn can mistake busy workers for hung ones
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def pre_fork(server, worker):
+    # Nothing should connect to the database while preloading, but a
+    # connection left open in the master would be shared by every worker.
+    from django.db import connections
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Write notifications still buffered in this worker before it goes away.
+    from notifications.buffer import flush
+    flush()
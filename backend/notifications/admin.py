@@ -0,0 +1,15 @@
+from django.contrib import admin
+from core.admin import ScalableModelAdmin
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(ScalableModelAdmin):
+    list_display = ('id', 'recipient', 'verb', 'actor_count', 'is_read', 'updated_at')
+    list_select_related = ('recipient',)
+    list_filter = ('verb', 'is_read')
+    search_fields = ('=recipient__username',)
+    raw_id_fields = ('recipient', 'post', 'group', 'last_actor')
+    readonly_fields = ('recent_actor_ids',)
+    date_hierarchy = 'updated_at'
+    ordering = ('-updated_at', '-id')
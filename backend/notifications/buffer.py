@@ -0,0 +1,232 @@
+# backend/notifications/buffer.py
+"""
+Write path for notifications.
+
+notify() never touches the database. Events are queued once the request's
+transaction commits and a background thread in each worker writes them in
+batches: events for the same unread notification are coalesced in memory,
+matched against existing unread rows with one query, then written with one
+bulk_update and one bulk_create. A popular post gets one row per author,
+not one per comment.
+
+Queued events live in worker memory. They are flushed when the worker
+exits cleanly (max_requests recycling, restarts, SIGTERM, see the
+worker_exit hook in gunicorn.conf.py), but a worker killed with SIGKILL or
+by the gunicorn timeout loses up to NOTIFICATIONS_FLUSH_INTERVAL seconds of
+them. That's acceptable for notifications; don't route anything through
+here that must not be lost.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RECENT_ACTORS_KEPT = 20
+UPDATE_FIELDS = ['actor_count', 'recent_actor_ids', 'last_actor', 'updated_at']
+
+_lock = threading.Lock()
+_pending = []
+_wakeup = threading.Event()
+_worker = None
+_worker_pid = None
+
+
+def notify(recipient_id, verb, actor_id, post_id=None, group_id=None):
+    """
+    Queues a notification for `recipient_id`. Self-notifications are dropped.
+    """
+    if recipient_id is None or recipient_id == actor_id:
+        return
+    event = (recipient_id, verb, post_id, group_id, actor_id)
+    transaction.on_commit(lambda: _enqueue(event))
+
+
+def _enqueue(event):
+    if not settings.NOTIFICATIONS_ASYNC:
+        write_events([event])
+        return
+    with _lock:
+        _pending.append(event)
+        full = len(_pending) >= settings.NOTIFICATIONS_BATCH_SIZE
+    _ensure_worker()
+    if full:
+        _wakeup.set()
+
+
+def _ensure_worker():
+    global _worker, _worker_pid
+    # Threads don't survive a fork, so each worker process starts its own.
+    if _worker is not None and _worker.is_alive() and _worker_pid == os.getpid():
+        return
+    with _lock:
+        if _worker is not None and _worker.is_alive() and _worker_pid == os.getpid():
+            return
+        _worker_pid = os.getpid()
+        _worker = threading.Thread(target=_run, name='notification-writer', daemon=True)
+        _worker.start()
+
+
+def _run():
+    while True:
+        _wakeup.wait(settings.NOTIFICATIONS_FLUSH_INTERVAL)
+        _wakeup.clear()
+        try:
+            flush()
+        except Exception:
+            logger.exception("Failed to write notifications")
+
+
+def flush():
+    """
+    Writes everything queued so far. Returns the number of events written.
+    """
+    with _lock:
+        events = _pending[:]
+        del _pending[:]
+    if not events:
+        return 0
+
+    close_old_connections()
+    try:
+        batch_size = settings.NOTIFICATIONS_BATCH_SIZE
+        for start in range(0, len(events), batch_size):
+            write_events(events[start:start + batch_size])
+    finally:
+        close_old_connections()
+    return len(events)
+
+
+atexit.register(flush)
+
+
+def write_events(events):
+    """
+    Coalesces (recipient, verb, post, group, actor) events into notification
+    rows with a fixed number of queries per batch.
+    """
+    from .models import Notification
+
+    now = timezone.now()
+    with transaction.atomic():
+        grouped = _coalesce(_drop_deleted(events))
+        if not grouped:
+            return
+
+        match = Q()
+        for recipient_id, verb, post_id, group_id in grouped:
+            match |= Q(recipient_id=recipient_id, verb=verb, post_id=post_id, group_id=group_id)
+
+        # Locked, so a concurrent mark-read either waits for us or wins and
+        # drops the row from this query; actors never land on a read row.
+        existing = {
+            (n.recipient_id, n.verb, n.post_id, n.group_id): n
+            for n in Notification.objects.select_for_update().filter(match, is_read=False).order_by()
+        }
+
+        to_update, to_create = [], []
+        for key, actors in grouped.items():
+            notification = existing.get(key)
+            if notification is None:
+                to_create.append((key, actors))
+            else:
+                _add_actors(notification, actors, now)
+                to_update.append(notification)
+
+        if to_update:
+            Notification.objects.bulk_update(to_update, UPDATE_FIELDS)
+        if to_create:
+            try:
+                with transaction.atomic():
+                    Notification.objects.bulk_create([_new_notification(key, actors, now) for key, actors in to_create])
+            except IntegrityError:
+                # Another worker created some of these since we looked; the
+                # unique unread index caught it, so merge row by row.
+                for key, actors in to_create:
+                    _create_or_merge(key, actors, now)
+
+
+def _coalesce(events):
+    grouped = OrderedDict()
+    for recipient_id, verb, post_id, group_id, actor_id in events:
+        actors = grouped.setdefault((recipient_id, verb, post_id, group_id), [])
+        if actor_id not in actors:
+            actors.append(actor_id)
+    return grouped
+
+
+def _existing_ids(model, ids):
+    # FOR NO KEY UPDATE: holds off purge_deleted's DELETE until this batch
+    # commits, without blocking inserts that reference the rows. Locked in pk
+    # order so concurrent writers can't deadlock on each other.
+    if not ids:
+        return set()
+    rows = model._base_manager.select_for_update(no_key=True).filter(pk__in=ids).order_by('pk')
+    return set(rows.values_list('pk', flat=True))
+
+
+def _drop_deleted(events):
+    """
+    Drops events whose recipient or group was purged since notify(), and
+    actors that no longer exist. The foreign keys are checked at commit, so
+    one stale id would otherwise fail the whole batch.
+    """
+    from django.contrib.auth import get_user_model
+    from groups.models import Group
+
+    users = _existing_ids(get_user_model(), {event[0] for event in events} | {event[4] for event in events})
+    groups = _existing_ids(Group, {event[3] for event in events if event[3] is not None})
+    return [
+        event for event in events
+        if event[0] in users and event[4] in users and (event[3] is None or event[3] in groups)
+    ]
+
+
+def _new_notification(key, actors, now):
+    from .models import Notification
+
+    recipient_id, verb, post_id, group_id = key
+    return Notification(
+        recipient_id=recipient_id, verb=verb, post_id=post_id, group_id=group_id,
+        last_actor_id=actors[-1], actor_count=len(actors),
+        recent_actor_ids=actors[-RECENT_ACTORS_KEPT:], updated_at=now,
+    )
+
+
+def _add_actors(notification, actors, now):
+    new_actors = [actor for actor in actors if actor not in notification.recent_actor_ids]
+    notification.actor_count += len(new_actors)
+    notification.recent_actor_ids = (notification.recent_actor_ids + new_actors)[-RECENT_ACTORS_KEPT:]
+    notification.last_actor_id = actors[-1]
+    notification.updated_at = now
+
+
+def _create_or_merge(key, actors, now):
+    """
+    Upsert of one notification against the unique unread index.
+    """
+    from .models import Notification
+
+    recipient_id, verb, post_id, group_id = key
+    while True:
+        try:
+            with transaction.atomic():
+                _new_notification(key, actors, now).save(force_insert=True)
+            return
+        except IntegrityError:
+            pass
+        notification = Notification.objects.select_for_update().filter(
+            recipient_id=recipient_id, verb=verb, post_id=post_id, group_id=group_id, is_read=False,
+        ).first()
+        if notification is not None:
+            _add_actors(notification, actors, now)
+            notification.save(update_fields=UPDATE_FIELDS)
+            return
+        # Marked read in between: try inserting again.
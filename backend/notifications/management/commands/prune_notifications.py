@@ -0,0 +1,34 @@
+# backend/notifications/management/commands/prune_notifications.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.db_router import use_primary
+from notifications.models import Notification
+
+
+class Command(BaseCommand):
+    help = "Deletes notifications not updated in the last NOTIFICATION_RETENTION_DAYS days, in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    @use_primary()
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        old = Notification.objects.filter(updated_at__lt=cutoff).order_by('pk')
+
+        deleted = 0
+        while True:
+            # Short transactions: a batch of ids at a time, never one huge DELETE.
+            ids = list(old.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            Notification.objects.filter(pk__in=ids).delete()
+            deleted += len(ids)
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} notifications older than {options['days']} days."))
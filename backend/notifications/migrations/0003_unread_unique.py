@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:31
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_duplicates_read(apps, schema_editor):
+    # Older writers could race and leave two unread rows for one target;
+    # keep the most recent one unread.
+    Notification = apps.get_model('notifications', 'Notification')
+    seen = set()
+    duplicates = []
+    unread = Notification.objects.filter(is_read=False).order_by('-updated_at', '-id')
+    for pk, recipient_id, verb, post_id, group_id in unread.values_list('pk', 'recipient_id', 'verb', 'post_id', 'group_id').iterator():
+        key = (recipient_id, verb, post_id, group_id)
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+    for start in range(0, len(duplicates), 1000):
+        Notification.objects.filter(pk__in=duplicates[start:start + 1000]).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_college_domain'),
+        ('notifications', '0002_notification_post_no_constraint'),
+        ('posts', '0007_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_unread_idx',
+        ),
+        migrations.RunPython(mark_duplicates_read, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(models.F('recipient'), models.F('verb'), django.db.models.functions.comparison.Coalesce('post', 0), django.db.models.functions.comparison.Coalesce('group', 0), condition=models.Q(('is_read', False)), name='notification_unread_uniq'),
+        ),
+    ]
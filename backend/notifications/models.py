@@ -0,0 +1,53 @@
+from django.db import models
+from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.utils import timezone
+from groups.models import Group
+from posts.models import Post
+
+class Notification(models.Model):
+    """
+    One row per coalesced event: while unread, new comments on the same
+    post (or new followers) bump `actor_count` on the existing row instead
+    of adding rows, e.g. "alice and 11 others commented on your post".
+    """
+    FOLLOW = 'follow'
+    COMMENT = 'comment'
+    GROUP_ADD = 'group_add'
+    VERB_CHOICES = [
+        (FOLLOW, 'Follow'),
+        (COMMENT, 'Comment'),
+        (GROUP_ADD, 'Added to group'),
+    ]
+
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+', null=True, blank=True, db_constraint=False)
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    last_actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name='+', null=True, blank=True)
+    actor_count = models.PositiveIntegerField(default=1)
+    # Last few actors, so the same person commenting twice isn't counted twice
+    recent_actor_ids = models.JSONField(default=list, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-updated_at', '-id']
+        indexes = [
+            models.Index(fields=['recipient', '-updated_at', '-id'], name='notification_recipient_idx'),
+            models.Index(fields=['updated_at'], name='notification_updated_idx'),
+        ]
+        constraints = [
+            # At most one unread row per target, so concurrent writers coalesce
+            # into it instead of racing to create duplicates. Also serves the
+            # unread count. NULL post/group would never conflict, hence the
+            # Coalesce.
+            models.UniqueConstraint(
+                'recipient', 'verb', Coalesce('post', 0), Coalesce('group', 0),
+                condition=models.Q(is_read=False), name='notification_unread_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.verb} notification for {self.recipient_id}'
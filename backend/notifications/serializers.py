@@ -0,0 +1,32 @@
+from rest_framework import serializers
+from .models import Notification
+
+class NotificationSerializer(serializers.ModelSerializer):
+    last_actor_username = serializers.ReadOnlyField(source='last_actor.username')
+    group_name = serializers.ReadOnlyField(source='group.name')
+    message = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'verb', 'message', 'last_actor', 'last_actor_username', 'actor_count',
+                  'post', 'group', 'group_name', 'is_read', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+    def get_message(self, obj):
+        actor = obj.last_actor.username if obj.last_actor else 'Someone'
+        others = obj.actor_count - 1
+        if others > 0:
+            actor = f"{actor} and {others} other{'s' if others > 1 else ''}"
+
+        if obj.verb == Notification.FOLLOW:
+            return f'{actor} started following you.'
+        if obj.verb == Notification.COMMENT:
+            return f'{actor} commented on your post.'
+        if obj.verb == Notification.GROUP_ADD:
+            group = obj.group.name if obj.group else 'a group'
+            return f'{actor} added you to {group}.'
+        return ''
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_null=True, max_length=1000)
@@ -0,0 +1,114 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from .buffer import flush, write_events
+from .models import Notification
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATIONS_ASYNC=True, NOTIFICATIONS_FLUSH_INTERVAL=3600)
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@iitb.ac.in', password='pw')
+        self.post = Post.objects.create(author=self.author, content='Exam tips')
+        self.commenters = [
+            User.objects.create_user(username=f'c{i}', email=f'c{i}@iitb.ac.in', password='pw') for i in range(3)
+        ]
+        self.client = APIClient()
+
+    def comment(self, user):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/posts/{self.post.pk}/comments/', {'content': 'thanks!'}, format='json')
+
+    def test_comments_are_coalesced_into_one_notification(self):
+        for user in self.commenters + [self.commenters[0], self.author]:
+            self.comment(user)
+        self.assertEqual(Notification.objects.count(), 0)  # still buffered
+
+        # Live-user check, unread lookup and one INSERT, plus the savepoints
+        with self.assertNumQueries(7):
+            self.assertEqual(flush(), 4)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 3)
+
+        self.comment(self.commenters[1])
+        User.objects.create_user(username='late', email='late@iitb.ac.in', password='pw')
+        self.comment(User.objects.get(username='late'))
+        flush()
+        notification.refresh_from_db()
+        self.assertEqual(notification.actor_count, 4)
+
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.get('/api/notifications/unread-count/').data, {'unread': 1})
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(response.data['results'][0]['message'], 'late and 3 others commented on your post.')
+
+        self.assertEqual(self.client.post('/api/notifications/mark-read/', {}, format='json').data, {'marked_read': 1})
+        self.assertEqual(self.client.get('/api/notifications/unread-count/').data, {'unread': 0})
+
+        # Once read, a new comment starts a fresh notification.
+        self.comment(self.commenters[2])
+        flush()
+        self.assertEqual(Notification.objects.filter(is_read=False).get().actor_count, 1)
+
+    def test_mark_read_validates_ids(self):
+        self.comment(self.commenters[0])
+        flush()
+        notification = Notification.objects.get()
+        self.client.force_authenticate(self.author)
+        for ids in (['x'], 'x', [None]):
+            with self.subTest(ids=ids):
+                response = self.client.post('/api/notifications/mark-read/', {'ids': ids}, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('ids', response.data)
+        response = self.client.post('/api/notifications/mark-read/', {'ids': [notification.pk]}, format='json')
+        self.assertEqual(response.data, {'marked_read': 1})
+
+    def test_one_unread_row_per_target(self):
+        self.comment(self.commenters[0])
+        flush()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Notification.objects.create(recipient=self.author, verb=Notification.COMMENT, post=self.post)
+        # Follow notifications have neither post nor group
+        Notification.objects.create(recipient=self.author, verb=Notification.FOLLOW)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Notification.objects.create(recipient=self.author, verb=Notification.FOLLOW)
+
+    def test_merges_into_a_row_created_concurrently(self):
+        # Another worker inserted the unread row after this batch looked for it
+        other = Notification.objects.create(
+            recipient=self.author, verb=Notification.COMMENT, post=self.post,
+            last_actor=self.commenters[0], recent_actor_ids=[self.commenters[0].pk],
+        )
+        real_filter = Notification.objects.filter
+        with mock.patch.object(Notification.objects, 'select_for_update') as select_for_update:
+            select_for_update.return_value.filter.side_effect = [Notification.objects.none(), real_filter(pk=other.pk)]
+            write_events([
+                (self.author.pk, Notification.COMMENT, self.post.pk, None, self.commenters[0].pk),
+                (self.author.pk, Notification.COMMENT, self.post.pk, None, self.commenters[1].pk),
+            ])
+        other.refresh_from_db()
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(other.actor_count, 2)
+        self.assertEqual(other.last_actor, self.commenters[1])
+
+    def test_events_for_purged_rows_are_dropped(self):
+        gone = User.objects.create_user(username='gone', email='gone@iitb.ac.in', password='pw')
+        gone_pk = gone.pk
+        User._base_manager.filter(pk=gone_pk).delete()
+        write_events([
+            (gone_pk, Notification.FOLLOW, None, None, self.commenters[0].pk),
+            (self.author.pk, Notification.FOLLOW, None, None, gone_pk),
+            (self.author.pk, Notification.GROUP_ADD, None, 999999, self.commenters[0].pk),
+            (self.author.pk, Notification.FOLLOW, None, None, self.commenters[1].pk),
+        ])
+        notification = Notification.objects.get()
+        self.assertEqual((notification.recipient, notification.verb), (self.author, Notification.FOLLOW))
+        self.assertEqual(notification.recent_actor_ids, [self.commenters[1].pk])
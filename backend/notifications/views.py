@@ -0,0 +1,54 @@
+from rest_framework import generics, status, views
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import Notification
+from .serializers import MarkReadSerializer, NotificationSerializer
+
+
+class NotificationPagination(CursorPagination):
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    ordering = ('-updated_at', '-id')
+
+
+class NotificationListView(generics.ListAPIView):
+    """
+    The current user's notifications, most recently updated first.
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(recipient=self.request.user).select_related('last_actor', 'group')
+        if self.request.query_params.get('unread'):
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+
+class UnreadCountView(views.APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        count = Notification.objects.filter(recipient=request.user, is_read=False).count()
+        return Response({'unread': count})
+
+
+class MarkReadView(views.APIView):
+    """
+    Marks notifications as read in one UPDATE: the given `ids`, or all of
+    them when no ids are sent.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = Notification.objects.filter(recipient=request.user, is_read=False)
+        ids = serializer.validated_data.get('ids')
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        updated = queryset.update(is_read=True)
+        return Response({'marked_read': updated}, status=status.HTTP_200_OK)
@@ -1,3 +1,58 @@
 from django.contrib import admin
+from django.utils.text import Truncator
+from core.admin import ScalableModelAdmin
+from .models import Post, Comment, ArchivedPost, ArchivedComment
 
-# Register your models here.
+
+@admin.register(Post)
+class PostAdmin(ScalableModelAdmin):
+    list_display = ('id', 'author', 'group', 'excerpt', 'created_at', 'pending_deletion')
+    list_select_related = ('author', 'group')
+    search_fields = ('=author__username',)
+    raw_id_fields = ('author', 'group')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+
+    @admin.display(description='Content')
+    def excerpt(self, obj):
+        return Truncator(obj.content).chars(80)
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableModelAdmin):
+    list_display = ('id', 'author', 'post_id', 'excerpt', 'created_at')
+    list_select_related = ('author',)
+    search_fields = ('=author__username',)
+    raw_id_fields = ('author', 'post')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+
+    @admin.display(description='Content')
+    def excerpt(self, obj):
+        return Truncator(obj.content).chars(80)
+
+
+class ArchiveAdmin(ScalableModelAdmin):
+    """Archived rows are read-only, archive_posts and purge_deleted manage them."""
+    list_select_related = ('author',)
+    search_fields = ('=author__username',)
+    ordering = ('-created_at', '-id')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedPost)
+class ArchivedPostAdmin(ArchiveAdmin):
+    list_display = ('id', 'author', 'group_id', 'created_at')
+
+
+@admin.register(ArchivedComment)
+class ArchivedCommentAdmin(ArchiveAdmin):
+    list_display = ('id', 'author', 'post_id', 'created_at')
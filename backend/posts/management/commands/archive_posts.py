@@ -0,0 +1,37 @@
+# backend/posts/management/commands/archive_posts.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from core.db_router import use_primary
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+from posts.partitioning import add_months, archive_partitions, archive_rows, is_partitioned, month_start
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves posts and comments older than --months months to the archive tables. "
+        "On PostgreSQL whole monthly partitions are detached and re-attached, elsewhere rows are copied in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=settings.POSTS_ARCHIVE_AFTER_MONTHS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    @use_primary()
+    def handle(self, *args, **options):
+        # Only whole months, so both strategies archive exactly the same rows
+        before = add_months(month_start(timezone.now().date()), -options['months'])
+
+        if is_partitioned(connection, Post._meta.db_table):
+            moved = archive_partitions(connection, before)
+            for name in moved:
+                self.stdout.write(f"Archived {name}")
+            self.stdout.write(self.style.SUCCESS(f"Archived {len(moved)} partitions older than {before}."))
+            return
+
+        posts = archive_rows(Post, ArchivedPost, before, options['batch_size'])
+        comments = archive_rows(Comment, ArchivedComment, before, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {posts} posts and {comments} comments older than {before}."))
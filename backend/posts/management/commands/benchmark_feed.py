@@ -0,0 +1,105 @@
+# backend/posts/management/commands/benchmark_feed.py
+
+import gzip
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+from posts.models import Post
+from posts.serializers import PostSerializer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks rendering of the /api/feed/ payload with the stock DRF "
+        "renderer vs the orjson renderer, and reports bytes on the wire "
+        "uncompressed, gzipped and brotli-compressed. With --username, also "
+        "times the feed's queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help="Render the real feed of this user instead of synthetic data.")
+        parser.add_argument('--posts', type=int, default=100, help="Synthetic posts in the payload.")
+        parser.add_argument('--comments', type=int, default=5, help="Synthetic comments per post.")
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if options['username']:
+            data = self.real_feed(options['username'])
+            start = time.perf_counter()
+            for _ in range(iterations):
+                self.real_feed(options['username'])
+            query_ms = (time.perf_counter() - start) * 1000 / iterations
+            self.stdout.write(f"Queries and serialization: {query_ms:.3f} ms per feed")
+        else:
+            data = self.synthetic_feed(options['posts'], options['comments'])
+
+        results = []
+        for label, renderer in (('DRF JSONRenderer', JSONRenderer()), ('ORJSONRenderer', ORJSONRenderer())):
+            body = renderer.render(data)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                renderer.render(data)
+            elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+            results.append((label, elapsed_ms, body))
+
+        self.stdout.write(f"Feed payload: {len(data)} posts, {iterations} iterations\n")
+        self.stdout.write(f"{'renderer':<20}{'ms/render':>12}{'raw bytes':>12}{'gzip':>10}{'br':>10}")
+        for label, elapsed_ms, body in results:
+            gzipped = len(gzip.compress(body, compresslevel=6))
+            brotlied = len(brotli.compress(body, quality=4)) if brotli else 0
+            self.stdout.write(f"{label:<20}{elapsed_ms:>12.3f}{len(body):>12}{gzipped:>10}{brotlied:>10}")
+
+        baseline, optimized = results[0][1], results[1][1]
+        if optimized:
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {baseline / optimized:.1f}x"))
+
+    def real_feed(self, username):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{username}' does not exist.")
+        following_users = user.following.values_list('following', flat=True)
+        queryset = Post.objects.filter(author__in=following_users, group__isnull=True)
+        return PostSerializer(queryset, many=True).data
+
+    def synthetic_feed(self, post_count, comment_count):
+        now = timezone.now()
+        feed = []
+        for i in range(post_count):
+            created_at = (now - timedelta(minutes=i)).isoformat()
+            feed.append({
+                'id': i,
+                'author': i % 40,
+                'author_username': f'student{i % 40}',
+                'author_profile_photo': f'/media/profile_photos/student{i % 40}.jpg',
+                'content': f'Post {i}: notes from the lecture, anyone up for a study group before the midsem? ' * 2,
+                'group': None,
+                'comments': [
+                    {
+                        'id': i * 100 + j,
+                        'author': j,
+                        'author_username': f'student{j}',
+                        'post': i,
+                        'content': f'Count me in! ({j})',
+                        'created_at': created_at,
+                    }
+                    for j in range(comment_count)
+                ],
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+        return feed
@@ -0,0 +1,27 @@
+# backend/posts/management/commands/ensure_post_partitions.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.partitioning import ensure_partitions, supports_partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the monthly post/comment partitions for the coming months (PostgreSQL only). "
+        "migrate_locked runs it on every deploy; also run it daily so long-lived deployments "
+        "never run out of partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.POST_PARTITIONS_AHEAD)
+
+    def handle(self, *args, **options):
+        if not supports_partitioning(connection):
+            self.stdout.write(f"{connection.vendor} tables aren't partitioned, nothing to do.")
+            return
+        created = ensure_partitions(connection, months_ahead=options['months_ahead'])
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(created)} partitions created."))
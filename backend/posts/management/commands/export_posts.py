@@ -0,0 +1,41 @@
+# backend/posts/management/commands/export_posts.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from groups.models import Group
+from posts.export import CHUNK_SIZE, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Streams a user's or a group's posts and comments as NDJSON or CSV to stdout or --output."
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--user', help="Username whose posts and comments to export")
+        target.add_argument('--group', type=int, help="Id of the group whose posts to export")
+        parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson')
+        parser.add_argument('--output', help="File to write, defaults to stdout")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['user']:
+            User = get_user_model()
+            try:
+                target = {'author': User.objects.get(username=options['user'])}
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['user']!r}.")
+        else:
+            try:
+                target = {'group': Group.objects.get(pk=options['group'])}
+            except Group.DoesNotExist:
+                raise CommandError(f"No group with id {options['group']}.")
+
+        lines = export_lines(options['format'], chunk_size=options['chunk_size'], **target)
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for line in lines:
+                    output.write(line.encode() if isinstance(line, str) else line)
+        else:
+            for line in lines:
+                self.stdout.write(line.decode() if isinstance(line, bytes) else line, ending='')
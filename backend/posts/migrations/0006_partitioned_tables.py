@@ -0,0 +1,67 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from posts.partitioning import partition_table
+
+
+def partition_posts(apps, schema_editor):
+    # PostgreSQL only, everywhere else the tables stay as they are
+    connection = schema_editor.connection
+    partition_table(connection, 'posts_post')
+    partition_table(connection, 'posts_comment')
+    partition_table(connection, 'posts_post_archive', months_ahead=None)
+    partition_table(connection, 'posts_comment_archive', months_ahead=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_deletion_requested_at'),
+        ('posts', '0005_post_deletion_requested_at'),
+        ('notifications', '0002_notification_post_no_constraint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='post',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.post'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedPost',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deletion_requested_at', models.DateTimeField(blank=True, null=True)),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='groups.group')),
+            ],
+            options={
+                'db_table': 'posts_post_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='comments', to='posts.archivedpost')),
+            ],
+            options={
+                'db_table': 'posts_comment_archive',
+                'ordering': ['created_at'],
+            },
+        ),
+        # Not reversed: the partitioned tables behave exactly like the plain ones
+        migrations.RunPython(partition_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:34
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def stamp_hidden_rows(apps, schema_editor):
+    # Posts and comments used to be hidden by joining to their author,
+    # group and post; now they carry the stamp themselves.
+    User = apps.get_model('users', 'User')
+    Group = apps.get_model('groups', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    ArchivedPost = apps.get_model('posts', 'ArchivedPost')
+    ArchivedComment = apps.get_model('posts', 'ArchivedComment')
+    now = timezone.now()
+
+    users = User.objects.filter(deletion_requested_at__isnull=False).values('pk')
+    Group.objects.filter(owner__in=users, deletion_requested_at__isnull=True).update(deletion_requested_at=now)
+    groups = Group.objects.filter(deletion_requested_at__isnull=False).values('pk')
+    for model in (Post, ArchivedPost):
+        model.objects.filter(deletion_requested_at__isnull=True, author__in=users).update(deletion_requested_at=now)
+        model.objects.filter(deletion_requested_at__isnull=True, group__in=groups).update(deletion_requested_at=now)
+
+    for model in (Comment, ArchivedComment):
+        model.objects.filter(author__in=users).update(deletion_requested_at=now)
+        for post_model in (Post, ArchivedPost):
+            posts = post_model.objects.filter(deletion_requested_at__isnull=False).values('pk')
+            model.objects.filter(deletion_requested_at__isnull=True, post_id__in=posts).update(deletion_requested_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_college_domain'),
+        ('users', '0006_college_domain'),
+        ('posts', '0007_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcomment',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='deletion_requested_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(stamp_hidden_rows, migrations.RunPython.noop),
+    ]
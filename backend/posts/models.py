@@ -1,8 +1,9 @@
 from django.db import models
 from django.conf import settings
+from core.deletion import PendingDeleteModel, PendingDeleteManager, VisibleManagerMixin, pending_index
 from groups.models import Group # 1. Import the Group model
 
-class Post(models.Model):
+class Post(PendingDeleteModel):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     content = models.TextField()
     # 2. Add the new group field
@@ -10,23 +11,90 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PendingDeleteManager()
+    all_objects = models.Manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            pending_index('post_pending_delete_idx'),
+            # Newest-first scans per author / per group, used by the feeds' keyset pagination
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_created_idx'),
+            models.Index(fields=['group', '-created_at', '-id'], name='post_group_created_idx'),
+            # Admin date drill-down and min/max over all posts
+            models.Index(fields=['created_at'], name='post_created_idx'),
+        ]
 
     def __str__(self):
         if self.group:
             return f'Post by {self.author.username} in {self.group.name}'
         return f'Post by {self.author.username}'
     
+class CommentManager(VisibleManagerMixin, models.Manager):
+    pass
+
 class Comment(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='comments')
-    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
+    # No DB constraint: posts_post is partitioned on PostgreSQL, see posts/partitioning.py
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments', db_constraint=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Stamped by purge_deleted along with its author or post (core/purge.py)
+    deletion_requested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = CommentManager()
+
     class Meta:
         ordering = ['created_at'] # Show oldest comments first
+        indexes = [models.Index(fields=['created_at'], name='comment_created_idx')]
+
+    @classmethod
+    def visible_q(cls):
+        # Comments aren't deleted on their own, only along with their author or post
+        return models.Q(deletion_requested_at__isnull=True)
 
     def __str__(self):
-        return f'Comment by {self.author.username} on {self.post}'
\ No newline at end of file
+        return f'Comment by {self.author.username} on {self.post}'
+
+
+class ArchivedPost(models.Model):
+    """
+    Posts moved out of posts_post by `archive_posts`. Read-only; the columns
+    mirror Post exactly since PostgreSQL attaches whole partitions here, so
+    a field added to Post has to be added here too.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    content = models.TextField()
+    group = models.ForeignKey(Group, on_delete=models.DO_NOTHING, related_name='+', null=True, blank=True, db_constraint=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deletion_requested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'posts_post_archive'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'Archived post {self.pk}'
+
+
+class ArchivedComment(models.Model):
+    """Comments moved out of posts_comment, mirrors Comment."""
+    id = models.BigIntegerField(primary_key=True)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    post = models.ForeignKey(ArchivedPost, on_delete=models.DO_NOTHING, related_name='comments', db_constraint=False)
+    content = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deletion_requested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'posts_comment_archive'
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f'Archived comment {self.pk}'
+
@@ -0,0 +1,256 @@
+# backend/posts/partitioning.py
+"""
+Monthly RANGE partitioning of posts and comments on PostgreSQL.
+
+posts_post and posts_comment are partitioned on created_at, one partition
+per month (posts_post_p2025_10, ...) plus a DEFAULT partition. Feed,
+profile and group queries filter and sort on created_at, so PostgreSQL
+prunes them to the recent partitions, and vacuum/index upkeep works on one
+month at a time.
+
+Old months are moved to posts_post_archive / posts_comment_archive, which
+are partitioned the same way, by detaching the partition and attaching it
+to the archive table: no rows are copied. Everywhere else (SQLite in
+development and tests) the tables stay plain and archiving copies rows
+across in batches, so the same models, views and commands work unchanged.
+
+Because PostgreSQL can't enforce a unique constraint on `id` alone across
+partitions, foreign keys pointing *at* these tables (Comment.post,
+Notification.post) are kept by Django only (db_constraint=False).
+"""
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+
+PARTITIONED_TABLES = ('posts_post', 'posts_comment')
+ARCHIVE_TABLES = {
+    'posts_post': 'posts_post_archive',
+    'posts_comment': 'posts_comment_archive',
+}
+
+partition_name_re = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    years, month = divmod(day.month - 1 + months, 12)
+    return date(day.year + years, month + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def partition_month(name):
+    match = partition_name_re.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def supports_partitioning(connection):
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(connection, table):
+    if not supports_partitioning(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection, table):
+    """
+    Monthly partitions of `table` as [(name, month), ...], oldest first.
+    The DEFAULT partition isn't included.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = [(name, partition_month(name)) for name in names]
+    return sorted((p for p in partitions if p[1] is not None), key=lambda p: p[1])
+
+
+def _bound(month):
+    return datetime.combine(month, time.min, tzinfo=dt_timezone.utc)
+
+
+def create_month_partition(connection, table, month):
+    """
+    Creates the partition of `table` holding `month`. Returns False when it
+    already exists.
+
+    PostgreSQL refuses to add a partition whose range already has rows in
+    the DEFAULT partition (it happens when ensure_post_partitions didn't run
+    for a while), so those rows are moved into the new partition first, in
+    the same transaction.
+    """
+    name = partition_name(table, month)
+    default = f'{table}_default'
+    bounds = [_bound(month), _bound(add_months(month, 1))]
+    qn = connection.ops.quote_name
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s), to_regclass(%s)', [name, default])
+        exists, has_default = cursor.fetchone()
+        if exists is not None:
+            return False
+        stranded = False
+        if has_default is not None:
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE created_at >= %s AND created_at < %s)', bounds,
+            )
+            stranded = cursor.fetchone()[0]
+        if not stranded:
+            cursor.execute(f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)', bounds)
+            return True
+
+        # Build the partition on the side, fill it from DEFAULT, then attach
+        # it: ATTACH creates the indexes and rechecks DEFAULT, now clear.
+        cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(default)} WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO {qn(name)} SELECT * FROM moved',
+            bounds,
+        )
+        cursor.execute(f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)', bounds)
+    return True
+
+
+def ensure_partitions(connection, months_ahead=3, today=None):
+    """
+    Makes sure the current month and the next `months_ahead` months have a
+    partition, so new rows never land in the DEFAULT partition. Returns the
+    names of the partitions created. A no-op outside PostgreSQL.
+    """
+    created = []
+    current = month_start(today or timezone.now().date())
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(connection, table):
+            continue
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if create_month_partition(connection, table, month):
+                created.append(partition_name(table, month))
+    return created
+
+
+def partition_table(connection, table, months_ahead=3):
+    """
+    Rebuilds `table` as a table partitioned by month on created_at, keeping
+    its rows, indexes and outgoing foreign keys. Used by the migration; a
+    no-op outside PostgreSQL or when the table is already partitioned.
+
+    With months_ahead=None no partitions are created at all, archive tables
+    only ever receive partitions detached from the live ones.
+    Nothing may reference `table` with a foreign key constraint anymore.
+    """
+    if not supports_partitioning(connection) or is_partitioned(connection, table):
+        return
+
+    qn = connection.ops.quote_name
+    old = f'{table}_unpartitioned'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'f')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        pkey = next(name for name, kind, _ in constraints if kind == 'p')
+        foreign_keys = [(name, definition) for name, kind, definition in constraints if kind == 'f']
+
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() "
+            "AND tablename = %s AND indexname <> %s",
+            [table, pkey],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(f'SELECT min(created_at) FROM {qn(table)}')
+        oldest = cursor.fetchone()[0]
+
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+        cursor.execute(f'ALTER TABLE {qn(old)} RENAME CONSTRAINT {qn(pkey)} TO {qn(old + "_pkey")}')
+        cursor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING IDENTITY '
+            f'INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE (created_at)'
+        )
+        # The partition key has to be part of the primary key.
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(pkey)} PRIMARY KEY (id, created_at)')
+
+    if months_ahead is not None:
+        current = month_start(timezone.now().date())
+        month = month_start(oldest.date()) if oldest else current
+        while month <= add_months(current, months_ahead):
+            create_month_partition(connection, table, month)
+            month = add_months(month, 1)
+
+    with connection.cursor() as cursor:
+        if months_ahead is not None:
+            cursor.execute(f'CREATE TABLE {qn(table + "_default")} PARTITION OF {qn(table)} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE((SELECT max(id) FROM {qn(table)}), 0) + 1, false)",
+            [table],
+        )
+        cursor.execute(f'DROP TABLE {qn(old)}')
+
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}')
+
+
+def archive_partitions(connection, before):
+    """
+    Moves whole monthly partitions ending on or before `before` (a date) to
+    the archive tables. Returns the names of the partitions moved.
+    """
+    qn = connection.ops.quote_name
+    moved = []
+    for table, archive in ARCHIVE_TABLES.items():
+        for name, month in list_partitions(connection, table):
+            if add_months(month, 1) > before:
+                continue
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}')
+                cursor.execute(
+                    f'ALTER TABLE {qn(archive)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)',
+                    [_bound(month), _bound(add_months(month, 1))],
+                )
+            moved.append(name)
+    return moved
+
+
+def archive_rows(model, archive_model, before, batch_size=1000):
+    """
+    Copy-and-delete fallback for unpartitioned tables: moves rows created
+    before `before` into `archive_model` in batches. Returns the row count.
+    """
+    fields = [field.attname for field in archive_model._meta.concrete_fields]
+    old_rows = model._base_manager.filter(created_at__lt=_bound(before)).order_by('pk')
+    moved = 0
+    while True:
+        rows = list(old_rows.values(*fields)[:batch_size])
+        if not rows:
+            return moved
+        with transaction.atomic():
+            archive_model.objects.bulk_create([archive_model(**row) for row in rows], ignore_conflicts=True)
+            # _raw_delete: no ORM cascade, newer comments on an archived post stay where they are.
+            model._base_manager.filter(pk__in=[row['id'] for row in rows])._raw_delete(model._base_manager.db)
+        moved += len(rows)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Post, Comment # Add Comment
+from users.serializers import AvatarField
+from .models import Post, Comment, ArchivedPost # Add Comment
 
 class CommentSerializer(serializers.ModelSerializer):
     author_username = serializers.ReadOnlyField(source='author.username')
@@ -12,12 +13,34 @@ class CommentSerializer(serializers.ModelSerializer):
 
 class PostSerializer(serializers.ModelSerializer):
     author_username = serializers.ReadOnlyField(source='author.username')
-    # Add this line to get the author's profile photo
-    author_profile_photo = serializers.ImageField(source='author.profile_photo', read_only=True)
+    # Small avatar rather than the full-size upload, feeds render dozens of these
+    author_profile_photo = AvatarField(source='author', size='small')
     comments = CommentSerializer(many=True, read_only=True)
 
     class Meta:
         model = Post
         # Add 'author_profile_photo' to the fields list
         fields = ['id', 'author', 'author_username', 'author_profile_photo', 'content', 'group', 'comments', 'created_at', 'updated_at']
-        read_only_fields = ['author']
\ No newline at end of file
+        read_only_fields = ['author']
+
+
+class ArchivedCommentSerializer(serializers.Serializer):
+    # Works for both archived and live comments on an archived post
+    id = serializers.IntegerField()
+    author = serializers.IntegerField(source='author_id')
+    author_username = serializers.ReadOnlyField(source='author.username')
+    post = serializers.IntegerField(source='post_id')
+    content = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class ArchivedPostSerializer(serializers.ModelSerializer):
+    author_username = serializers.ReadOnlyField(source='author.username')
+    author_profile_photo = AvatarField(source='author', size='small')
+    # Filled in by ArchivedPostViewSet.attach_comments
+    comments = ArchivedCommentSerializer(source='all_comments', many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedPost
+        fields = ['id', 'author', 'author_username', 'author_profile_photo', 'content', 'group', 'comments', 'created_at', 'updated_at']
+        read_only_fields = fields
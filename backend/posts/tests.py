@@ -1,3 +1,218 @@
-from django.test import TestCase
+import csv
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from groups.models import Group
+from relationships.models import Follow
+from .export import export_lines
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+from .partitioning import (
+    ARCHIVE_TABLES, PARTITIONED_TABLES, add_months, create_month_partition, is_partitioned, list_partitions,
+    month_start, partition_name,
+)
+
+User = get_user_model()
+
+
+class UnifiedFeedTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user(username='me', email='me@iitb.ac.in', password='pw')
+        self.friend = User.objects.create_user(username='friend', email='friend@iitb.ac.in', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@iitb.ac.in', password='pw')
+        Follow.objects.create(follower=self.me, following=self.friend)
+        self.group = Group.objects.create(name='Robotics', owner=self.stranger)
+        self.group.members.add(self.me, self.stranger)
+        other_group = Group.objects.create(name='Chess', owner=self.stranger)
+
+        self.expected = []
+        for i in range(5):
+            self.expected.append(Post.objects.create(author=self.friend, content=f'friend {i}'))
+            self.expected.append(Post.objects.create(author=self.stranger, group=self.group, content=f'group {i}'))
+            Post.objects.create(author=self.stranger, content='not followed')
+            Post.objects.create(author=self.friend, group=other_group, content='not joined')
+        self.expected.reverse()
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def test_merges_followed_and_group_posts_with_stable_cursor(self):
+        seen, url = [], '/api/feed/unified/?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [post['id'] for post in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [post.id for post in self.expected])
+
+    def test_merges_one_stream_per_author_and_group(self):
+        chess = Group.objects.get(name='Chess')
+        chess.members.add(self.me)
+        Follow.objects.create(follower=self.me, following=self.stranger)
+        response = self.client.get('/api/feed/unified/?page_size=100')
+        ids = [post['id'] for post in response.data['results']]
+        everything = Post.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(everything))
+
+    def test_rejects_garbage_cursor(self):
+        self.assertEqual(self.client.get('/api/feed/unified/?cursor=nope').status_code, 400)
+
+
+class ArchiveTests(TestCase):
+    """The copy-and-delete path used when the tables aren't partitioned."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@iitb.ac.in', password='pw')
+        self.old = Post.objects.create(author=self.author, content='old')
+        self.recent = Post.objects.create(author=self.author, content='recent')
+        Comment.objects.create(author=self.author, post=self.old, content='old comment')
+        late = Comment.objects.create(author=self.author, post=self.old, content='late comment')
+
+        two_years_ago = timezone.now() - timedelta(days=730)
+        Post.objects.filter(pk=self.old.pk).update(created_at=two_years_ago)
+        Comment.objects.exclude(pk=late.pk).update(created_at=two_years_ago)
+
+    def test_moves_old_rows_and_still_serves_them(self):
+        call_command('archive_posts', months=12, batch_size=1, stdout=StringIO())
+
+        self.assertEqual(list(Post.objects.values_list('id', flat=True)), [self.recent.id])
+        self.assertEqual(list(ArchivedPost.objects.values_list('id', flat=True)), [self.old.id])
+        self.assertEqual(ArchivedComment.objects.count(), 1)
+
+        response = APIClient().get('/api/archived-posts/?author_username=author')
+        self.assertEqual(response.status_code, 200)
+        [post] = response.data['results']
+        self.assertEqual(post['id'], self.old.id)
+        # The archived comment plus the one written after the archived month
+        self.assertEqual([c['content'] for c in post['comments']], ['old comment', 'late comment'])
+
+
+    def test_group_export_and_pending_rules_cover_archived_posts(self):
+        group = Group.objects.create(name='Robotics', owner=self.author)
+        group.members.add(self.author)
+        Post.objects.filter(pk=self.old.pk).update(group=group)
+        call_command('archive_posts', months=12, stdout=StringIO())
+
+        client = APIClient()
+        client.force_authenticate(self.author)
+        response = client.get(f'/api/export/posts.ndjson?group={group.pk}')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        # The late comment is still live while its post is archived
+        self.assertEqual(
+            [(row['type'], row['content'], row['group_id']) for row in rows],
+            [('post', 'old', group.pk), ('comment', 'old comment', group.pk), ('comment', 'late comment', group.pk)],
+        )
+
+        group.delete()
+        call_command('purge_deleted', hide_only=True, stdout=StringIO())
+        self.assertEqual(client.get(f'/api/archived-posts/?group={group.pk}').data['results'], [])
+        self.author.delete()
+        call_command('purge_deleted', hide_only=True, stdout=StringIO())
+        self.assertEqual(client.get('/api/archived-posts/').data['results'], [])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@iitb.ac.in', password='pw')
+        self.other = User.objects.create_user(username='other', email='other@iitb.ac.in', password='pw')
+        post = Post.objects.create(author=self.author, content='hello, "world"')
+        Comment.objects.create(author=self.author, post=post, content='first')
+        Post.objects.create(author=self.other, content='not mine')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_streams_ndjson_and_csv(self):
+        response = self.client.get('/api/export/posts.ndjson?author_username=author')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['type'], row['content']) for row in rows], [('post', 'hello, "world"'), ('comment', 'first')])
+
+        response = self.client.get('/api/export/posts.csv?author_username=author')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([row['content'] for row in rows], ['hello, "world"', 'first'])
+
+    def test_only_own_account(self):
+        self.assertEqual(self.client.get('/api/export/posts.ndjson?author_username=other').status_code, 403)
+
+    def test_comment_groups_are_looked_up_per_chunk(self):
+        group = Group.objects.create(name='Robotics', owner=self.other)
+        group_post = Post.objects.create(author=self.other, group=group, content='meetup')
+        for i in range(3):
+            Comment.objects.create(author=self.author, post=group_post, content=f'in {i}')
+
+        rows = [json.loads(line) for line in export_lines('ndjson', author=self.author, chunk_size=2)]
+        self.assertEqual(
+            [(row['content'], row['group_id']) for row in rows if row['type'] == 'comment'],
+            [('first', None), ('in 0', group.pk), ('in 1', group.pk), ('in 2', group.pk)],
+        )
+        # One query per table, plus two post lookups for each chunk of comments
+        with self.assertNumQueries(4 + 2 * 2):
+            list(export_lines('ndjson', author=self.author, chunk_size=2))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'posts are only partitioned on PostgreSQL')
+class PartitioningTests(TransactionTestCase):
+    """
+    Real partitions: ALTER TABLE can't run while the deferred foreign key
+    checks of a TestCase transaction are pending.
+    """
+    def setUp(self):
+        self.old_month = add_months(month_start(timezone.now().date()), -24)
+        for table in PARTITIONED_TABLES:
+            create_month_partition(connection, table, self.old_month)
+            self.addCleanup(self.drop_table, partition_name(table, self.old_month))
+
+    def drop_table(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(name)}')
+
+    def test_old_months_move_to_the_archive(self):
+        for table in [*PARTITIONED_TABLES, *ARCHIVE_TABLES.values()]:
+            self.assertTrue(is_partitioned(connection, table), table)
+        current = month_start(timezone.now().date())
+        self.assertIn(current, [month for _, month in list_partitions(connection, 'posts_post')])
+
+        author = User.objects.create_user(username='author', email='author@iitb.ac.in', password='pw')
+        old = Post.objects.create(author=author, content='old')
+        comment = Comment.objects.create(author=author, post=old, content='old comment')
+        Comment.objects.create(author=author, post=old, content='late comment')
+        # Rows move to the old month's partition
+        stamp = datetime(self.old_month.year, self.old_month.month, 2, tzinfo=dt_timezone.utc)
+        Post.objects.filter(pk=old.pk).update(created_at=stamp)
+        Comment.objects.filter(pk=comment.pk).update(created_at=stamp)
+
+        call_command('archive_posts', months=12, stdout=StringIO())
+
+        for table, archive in ARCHIVE_TABLES.items():
+            self.assertEqual(list_partitions(connection, archive), [(partition_name(table, self.old_month), self.old_month)])
+        self.assertFalse(Post.objects.filter(pk=old.pk).exists())
+        self.assertEqual(ArchivedPost.objects.get().pk, old.pk)
+        self.assertEqual(ArchivedComment.objects.get().pk, comment.pk)
+
+        [post] = APIClient().get('/api/archived-posts/').data['results']
+        self.assertEqual([c['content'] for c in post['comments']], ['old comment', 'late comment'])
+
+    def test_rows_in_the_default_partition_move_to_a_new_month(self):
+        # A month nobody created a partition for in time
+        late_month = add_months(month_start(timezone.now().date()), 24)
+        self.addCleanup(self.drop_table, partition_name('posts_post', late_month))
+        author = User.objects.create_user(username='author', email='author@iitb.ac.in', password='pw')
+        post = Post.objects.create(author=author, content='from the future')
+        Post.objects.filter(pk=post.pk).update(created_at=datetime(late_month.year, late_month.month, 3, tzinfo=dt_timezone.utc))
+
+        self.assertTrue(create_month_partition(connection, 'posts_post', late_month))
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM posts_post_default')
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute(f"SELECT count(*) FROM {partition_name('posts_post', late_month)}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(Post.objects.get().content, 'from the future')
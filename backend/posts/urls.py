@@ -1,9 +1,10 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework_nested import routers
-from .views import PostViewSet, FeedView, CommentViewSet
+from .views import PostViewSet, FeedView, UnifiedFeedView, CommentViewSet, ArchivedPostViewSet, PostExportView
 
 router = routers.DefaultRouter()
 router.register(r'posts', PostViewSet, basename='post')
+router.register(r'archived-posts', ArchivedPostViewSet, basename='archived-post')
 
 # Create a nested router for comments under posts
 posts_router = routers.NestedDefaultRouter(router, r'posts', lookup='post')
@@ -13,4 +14,6 @@ urlpatterns = [
     path('', include(router.urls)),
     path('', include(posts_router.urls)),
     path('feed/', FeedView.as_view(), name='user-feed'),
+    path('feed/unified/', UnifiedFeedView.as_view(), name='user-unified-feed'),
+    re_path(r'^export/posts\.(?P<fmt>ndjson|csv)$', PostExportView.as_view(), name='post-export'),
 ]
\ No newline at end of file
@@ -1,8 +1,26 @@
+import base64
+import heapq
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Prefetch, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, generics
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.views import APIView
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from .models import Post, Comment
-from .serializers import PostSerializer, CommentSerializer
+from notifications.buffer import notify
+from groups.models import Group
+from notifications.models import Notification
+from .export import FORMATS, export_lines
+from .models import Post, Comment, ArchivedPost, ArchivedComment
+from .serializers import PostSerializer, CommentSerializer, ArchivedPostSerializer
 from .permissions import IsAuthorOrReadOnly
 
 class PostViewSet(viewsets.ModelViewSet):
@@ -44,6 +62,106 @@ class FeedView(generics.ListAPIView):
             group__isnull=True
         )
     
+class UnifiedFeedView(generics.GenericAPIView):
+    """
+    Personal posts from followed users merged with posts from every group the
+    user has joined, newest first.
+
+    Every followed author and every joined group is its own stream, read
+    with a keyset query ((created_at, id) < cursor) that walks the
+    (author, created_at) / (group, created_at) index and stops after one
+    page. On PostgreSQL the streams are sent as UNION ALL queries of up to
+    `streams_per_query` each. The already sorted streams are merged in
+    Python, so no query ever sorts more than a page per stream, however
+    many posts the groups hold. Paginate by following `next`; `?cursor=`
+    is opaque.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    page_size = 20
+    max_page_size = 100
+    streams_per_query = 100
+
+    def get(self, request, *args, **kwargs):
+        page_size = self.get_page_size()
+        cursor = self.decode_cursor(request.query_params.get('cursor'))
+
+        following_users = request.user.following.values_list('following', flat=True)
+        joined_groups = request.user.joined_groups.values_list('id', flat=True)
+        # Disjoint: personal posts have no group, and a post is in one group.
+        streams = [Post.objects.filter(author_id=user_id, group__isnull=True) for user_id in following_users]
+        streams += [Post.objects.filter(group_id=group_id) for group_id in joined_groups]
+
+        merged = heapq.merge(*self.stream_keys(streams, cursor, page_size + 1), reverse=True)
+        keys = list(islice(merged, page_size + 1))
+        has_next = len(keys) > page_size
+        keys = keys[:page_size]
+
+        ids = [post_id for _, post_id in keys]
+        by_id = (
+            Post.objects.select_related('author', 'group')
+            .prefetch_related(Prefetch('comments', queryset=Comment.objects.select_related('author')))
+            .in_bulk(ids)
+        )
+        posts = [by_id[post_id] for post_id in ids if post_id in by_id]
+
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', self.encode_cursor(*keys[-1]))
+
+        serializer = self.get_serializer(posts, many=True)
+        return Response({'next': next_url, 'results': serializer.data})
+
+    def stream_keys(self, streams, cursor, limit):
+        """
+        Returns one list of (created_at, id) per batch of streams, each sorted
+        newest first and holding at most `limit` keys.
+        """
+        pages = [self.keyset_page(queryset, cursor).values_list('created_at', 'id')[:limit] for queryset in streams]
+        if not pages:
+            return []
+        if not connections[pages[0].db].features.supports_slicing_ordering_in_compound:
+            # SQLite can't LIMIT inside a UNION: one query per stream.
+            return [list(page) for page in pages]
+
+        batches = []
+        for i in range(0, len(pages), self.streams_per_query):
+            first, *rest = pages[i:i + self.streams_per_query]
+            if rest:
+                first = first.union(*rest, all=True).order_by('-created_at', '-id')[:limit]
+            batches.append(list(first))
+        return batches
+
+    def get_page_size(self):
+        try:
+            page_size = int(self.request.query_params.get('page_size', self.page_size))
+        except ValueError:
+            page_size = self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    @staticmethod
+    def keyset_page(queryset, cursor):
+        if cursor is not None:
+            created_at, post_id = cursor
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=post_id))
+        return queryset.order_by('-created_at', '-id')
+
+    @staticmethod
+    def encode_cursor(created_at, post_id):
+        raw = f'{created_at.isoformat()}|{post_id}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(value):
+        if not value:
+            return None
+        try:
+            created_at, post_id = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+            return datetime.fromisoformat(created_at), int(post_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+
+
 class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
@@ -51,4 +169,95 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         post = get_object_or_404(Post, pk=self.kwargs['post_pk'])
-        serializer.save(author=self.request.user, post=post)
\ No newline at end of file
+        serializer.save(author=self.request.user, post=post)
+        notify(post.author_id, Notification.COMMENT, self.request.user.pk, post_id=post.pk)
+
+
+class ArchivePagination(CursorPagination):
+    ordering = ('-created_at', '-id')
+    page_size = 20
+
+
+class ArchivedPostViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Posts moved to the archive tables by `archive_posts`, read-only.
+    Filters like PostViewSet: ?author_username= and ?group=.
+    """
+    serializer_class = ArchivedPostSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = ArchivePagination
+    sheddable = True
+
+    def get_queryset(self):
+        # purge_deleted stamps it along with a pending author or group, like Post
+        queryset = ArchivedPost.objects.filter(deletion_requested_at__isnull=True).select_related('author')
+        author_username = self.request.query_params.get('author_username')
+        group_id = self.request.query_params.get('group')
+
+        if author_username is not None:
+            queryset = queryset.filter(author__username=author_username)
+        if group_id is not None:
+            queryset = queryset.filter(group_id=group_id)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.attach_comments(page)
+        return page
+
+    def get_object(self):
+        post = super().get_object()
+        self.attach_comments([post])
+        return post
+
+    @staticmethod
+    def attach_comments(posts):
+        """
+        An archived post's comments can be archived or, if written after the
+        post's month was archived, still live. Two queries for the whole page.
+        """
+        by_post = {post.id: post for post in posts}
+        for post in posts:
+            post.all_comments = []
+        for model in (ArchivedComment, Comment):
+            comments = model._base_manager.filter(
+                post_id__in=by_post, deletion_requested_at__isnull=True,
+            ).select_related('author')
+            for comment in comments:
+                by_post[comment.post_id].all_comments.append(comment)
+        for post in posts:
+            post.all_comments.sort(key=lambda comment: (comment.created_at, comment.id))
+
+
+class PostExportView(APIView):
+    """
+    Streams posts and comments as NDJSON (export/posts.ndjson) or CSV
+    (export/posts.csv): ?author_username= for your own account, or ?group=
+    for a group you belong to. Staff can export anything.
+    """
+    permission_classes = [IsAuthenticated]
+    sheddable = True
+
+    def get(self, request, fmt):
+        author_username = request.query_params.get('author_username')
+        group_id = request.query_params.get('group')
+        if (author_username is None) == (group_id is None):
+            raise ValidationError('Pass exactly one of author_username or group.')
+
+        user = request.user
+        if author_username is not None:
+            author = get_object_or_404(get_user_model(), username=author_username)
+            if author != user and not user.is_staff:
+                raise PermissionDenied('You can only export your own posts.')
+            lines, name = export_lines(fmt, author=author), f'posts-{author.username}.{fmt}'
+        else:
+            group = get_object_or_404(Group, pk=group_id) if group_id.isdigit() else None
+            if group is None:
+                raise ValidationError({'group': 'Must be a group id.'})
+            if not (user.is_staff or group.owner_id == user.pk or group.members.filter(pk=user.pk).exists()):
+                raise PermissionDenied('You can only export groups you belong to.')
+            lines, name = export_lines(fmt, group=group), f'posts-group-{group.pk}.{fmt}'
+
+        response = StreamingHttpResponse(lines, content_type=FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{name}"'
+        return response
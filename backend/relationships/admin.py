@@ -1,3 +1,41 @@
 from django.contrib import admin
+from core.admin import ScalableModelAdmin
+from .models import Follow, SuggestionChange, UserSuggestions
 
-# Register your models here.
+
+@admin.register(Follow)
+class FollowAdmin(ScalableModelAdmin):
+    list_display = ('id', 'follower', 'following', 'created_at')
+    list_select_related = ('follower', 'following')
+    search_fields = ('=follower__username', '=following__username')
+    raw_id_fields = ('follower', 'following')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+
+    # Read-only: follows change through FollowView and purge_deleted, which
+    # keep User.followers_count / following_count in step.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(UserSuggestions)
+class UserSuggestionsAdmin(ScalableModelAdmin):
+    list_display = ('user', 'is_stale', 'computed_at')
+    list_select_related = ('user',)
+    list_filter = ('is_stale',)
+    search_fields = ('=user__username',)
+    raw_id_fields = ('user',)
+    readonly_fields = ('candidates', 'computed_at')
+    ordering = ('-pk',)
+
+
+@admin.register(SuggestionChange)
+class SuggestionChangeAdmin(ScalableModelAdmin):
+    list_display = ('id', 'user_id', 'group_id', 'created_at')
+    ordering = ('-pk',)
@@ -0,0 +1,31 @@
+# backend/relationships/management/commands/compute_suggestions.py
+
+from django.core.management.base import BaseCommand
+
+from core.db_router import use_primary
+from relationships.models import UserSuggestions
+from relationships.suggestions import apply_suggestion_changes, ensure_suggestion_rows, refresh_stale_suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes 'people you may know' for users whose follows or group "
+        "memberships changed since the last run. Meant to run every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Recompute every user, not just stale ones.")
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=None, help="Stop after this many users.")
+
+    @use_primary()
+    def handle(self, *args, **options):
+        created = ensure_suggestion_rows()
+        apply_suggestion_changes()
+        if options['all']:
+            UserSuggestions.objects.update(is_stale=True)
+
+        processed = refresh_stale_suggestions(batch_size=options['batch_size'], limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed suggestions for {processed} users ({created} new)."
+        ))
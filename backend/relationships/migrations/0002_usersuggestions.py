@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-19 13:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('relationships', '0001_initial'),
+        ('users', '0003_user_follow_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSuggestions',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='suggestions', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('candidates', models.JSONField(blank=True, default=list)),
+                ('is_stale', models.BooleanField(db_index=True, default=True)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
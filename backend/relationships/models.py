@@ -1,15 +1,104 @@
 from django.db import models
 from django.conf import settings
 
+
+class FollowQuerySet(models.QuerySet):
+    def status_for(self, user, keys, key='id'):
+        """
+        Follow flags between `user` and each of `keys` (user ids, or
+        usernames with key='username') in a single query. Both directions
+        are served by indexes: (follower, following) from the unique
+        constraint and the index on following.
+
+        Returns {key: {'following': ..., 'followed_by': ..., 'mutual': ...}}.
+        """
+        status = {k: {'following': False, 'followed_by': False, 'mutual': False} for k in keys}
+        if user is None or not user.is_authenticated or not status:
+            return status
+
+        rows = self.filter(
+            models.Q(follower=user, **{f'following__{key}__in': status})
+            | models.Q(following=user, **{f'follower__{key}__in': status})
+        ).order_by().values_list(f'follower__{key}', f'following__{key}')
+
+        own_key = getattr(user, key)
+        for follower_key, following_key in rows:
+            if follower_key == own_key:
+                status[following_key]['following'] = True
+            else:
+                status[follower_key]['followed_by'] = True
+        for flags in status.values():
+            flags['mutual'] = flags['following'] and flags['followed_by']
+        return status
+
+    def following_ids(self, follower, user_ids):
+        """
+        Which of `user_ids` `follower` follows, as a set, in one query.
+        """
+        if follower is None or not follower.is_authenticated or not user_ids:
+            return set()
+        return set(
+            self.filter(follower=follower, following_id__in=user_ids)
+            .order_by()
+            .values_list('following_id', flat=True)
+        )
+
+
+class FollowManager(models.Manager.from_queryset(FollowQuerySet)):
+    """
+    No visibility filter: the follows of an account pending deletion are
+    deleted by purge_deleted instead of being joined away on every read.
+    """
+
+
 class Follow(models.Model):
     follower = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='following', on_delete=models.CASCADE)
     following = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='followers', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = FollowManager()
+
     class Meta:
         # A user cannot follow the same person more than once
         unique_together = ('follower', 'following')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='follow_created_idx'),
+            # Follower/following lists, newest first, without sorting every row
+            models.Index(fields=['following', '-created_at'], name='follow_following_created_idx'),
+            models.Index(fields=['follower', '-created_at'], name='follow_follower_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.follower.username} follows {self.following.username}'
+
+class UserSuggestions(models.Model):
+    """
+    Precomputed "people you may know" list for one user, rebuilt by the
+    compute_suggestions command whenever `is_stale` is set (see signals.py).
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, primary_key=True, related_name='suggestions', on_delete=models.CASCADE)
+    # Best first: [[candidate_id, score, mutual_follows, shared_groups, same_college], ...]
+    candidates = models.JSONField(default=list, blank=True)
+    is_stale = models.BooleanField(default=True, db_index=True)
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Suggestions for {self.user_id}'
+
+
+class SuggestionChange(models.Model):
+    """
+    A follow or membership change whose fan-out hasn't happened yet. The
+    request only records the id; compute_suggestions marks everyone affected
+    stale (see suggestions.apply_suggestion_changes), so a popular user or a
+    large group costs one insert on the request path.
+    """
+    # Someone this user follows changed: their followers' friend-of-friend candidates did too
+    user_id = models.BigIntegerField(null=True, blank=True)
+    # Membership changed: every member gains or loses a shared-group candidate
+    group_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f'{self.follower.username} follows {self.following.username}'
\ No newline at end of file
+        return f'Change for user {self.user_id}' if self.user_id else f'Change for group {self.group_id}'
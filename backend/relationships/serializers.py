@@ -1,7 +1,49 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from users.serializers import AvatarField
 from .models import Follow
 
+User = get_user_model()
+
 class FollowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Follow
-        fields = ['id', 'follower', 'following', 'created_at']
\ No newline at end of file
+        fields = ['id', 'follower', 'following', 'created_at']
+
+class FollowUserSerializer(serializers.ModelSerializer):
+    """
+    A row in a followers/following list. `is_following` tells whether the
+    requesting user follows this person; the view looks those up for the
+    whole page at once and passes them in as `following_ids`.
+    """
+    profile_photo = AvatarField(size='small')
+    is_following = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'profile_photo', 'followers_count', 'is_following']
+
+    def get_is_following(self, obj):
+        return obj.pk in self.context.get('following_ids', ())
+
+
+class SuggestedUserSerializer(FollowUserSerializer):
+    """
+    A "people you may know" entry with the reasons it was suggested, taken
+    from the precomputed row passed in as `details`.
+    """
+    mutual_follows = serializers.SerializerMethodField()
+    shared_groups = serializers.SerializerMethodField()
+    same_college = serializers.SerializerMethodField()
+
+    class Meta(FollowUserSerializer.Meta):
+        fields = FollowUserSerializer.Meta.fields + ['mutual_follows', 'shared_groups', 'same_college']
+
+    def get_mutual_follows(self, obj):
+        return self.context['details'][obj.pk][2]
+
+    def get_shared_groups(self, obj):
+        return self.context['details'][obj.pk][3]
+
+    def get_same_college(self, obj):
+        return bool(self.context['details'][obj.pk][4])
@@ -0,0 +1,43 @@
+# backend/relationships/signals.py
+
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from groups.models import Group
+from .models import Follow, SuggestionChange, UserSuggestions
+
+
+def mark_suggestions_stale(condition):
+    UserSuggestions.objects.filter(condition).update(is_stale=True)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    # The follower's own list changes now; the friend-of-friend candidates of
+    # everyone who follows them are marked by compute_suggestions.
+    mark_suggestions_stale(Q(user_id=instance.follower_id))
+    SuggestionChange.objects.create(user_id=instance.follower_id)
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+def group_members_changed(sender, instance, action, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    Membership = Group.members.through
+    if isinstance(instance, Group):
+        group_ids = [instance.pk]
+        if action == 'pre_clear':
+            # Nobody is left in the group by the time the change is applied.
+            mark_suggestions_stale(Q(user__in=Membership.objects.filter(group_id=instance.pk).values('user_id')))
+        changed_users = list(pk_set or [])
+    else:
+        # Changed from the user side (user.joined_groups.add(...))
+        group_ids = list(pk_set) if pk_set else list(
+            Membership.objects.filter(user_id=instance.pk).values_list('group_id', flat=True)
+        )
+        changed_users = [instance.pk]
+    if changed_users:
+        mark_suggestions_stale(Q(user_id__in=changed_users))
+    SuggestionChange.objects.bulk_create([SuggestionChange(group_id=group_id) for group_id in group_ids])
@@ -0,0 +1,147 @@
+# backend/relationships/suggestions.py
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils import timezone
+
+from groups.models import Group
+from .models import Follow, SuggestionChange, UserSuggestions
+
+User = get_user_model()
+
+# How much each signal is worth when ranking a candidate.
+MUTUAL_FOLLOW_WEIGHT = 3
+SHARED_GROUP_WEIGHT = 2
+SAME_COLLEGE_WEIGHT = 1
+
+# Candidates stored per user, and how many are pulled from each source.
+SUGGESTIONS_LIMIT = 50
+SOURCE_LIMIT = 500
+
+
+def compute_candidates(user):
+    """
+    Ranks people `user` may know by friends-of-friends, shared groups and
+    same college (User.college_domain). Runs a handful of grouped queries, no matter
+    how large the user's network is.
+    """
+    following = Follow.objects.filter(follower=user).values('following')
+    excluded = set(Follow.objects.filter(follower=user).values_list('following_id', flat=True)) | {user.pk}
+
+    mutual = dict(
+        Follow.objects.filter(follower__in=following)
+        .exclude(following_id__in=excluded)
+        .values('following_id')
+        .annotate(total=Count('id'))
+        .order_by('-total')
+        .values_list('following_id', 'total')[:SOURCE_LIMIT]
+    )
+
+    Membership = Group.members.through
+    my_groups = Membership.objects.filter(user_id=user.pk).values('group_id')
+    shared = dict(
+        Membership.objects.filter(group_id__in=my_groups)
+        .exclude(user_id__in=excluded)
+        .values('user_id')
+        .annotate(total=Count('id'))
+        .order_by('-total')
+        .values_list('user_id', 'total')[:SOURCE_LIMIT]
+    )
+
+    domain = user.college_domain
+    candidate_ids = set(mutual) | set(shared)
+    same_college = set()
+    if domain:
+        same_college = set(
+            User.objects.filter(pk__in=candidate_ids, college_domain=domain).values_list('pk', flat=True)
+        )
+        if len(candidate_ids) < SUGGESTIONS_LIMIT:
+            # Top up thin networks (new accounts) with recent sign-ups from the same college.
+            newcomers = (
+                User.objects.filter(college_domain=domain)
+                .exclude(pk__in=excluded | candidate_ids)
+                .order_by('-date_joined')
+                .values_list('pk', flat=True)[:SUGGESTIONS_LIMIT - len(candidate_ids)]
+            )
+            same_college.update(newcomers)
+            candidate_ids.update(newcomers)
+
+    ranked = []
+    for pk in candidate_ids:
+        m, s, c = mutual.get(pk, 0), shared.get(pk, 0), int(pk in same_college)
+        score = m * MUTUAL_FOLLOW_WEIGHT + s * SHARED_GROUP_WEIGHT + c * SAME_COLLEGE_WEIGHT
+        ranked.append([pk, score, m, s, c])
+    ranked.sort(key=lambda row: (-row[1], -row[0]))
+    return ranked[:SUGGESTIONS_LIMIT]
+
+
+def ensure_suggestion_rows(batch_size=1000):
+    """
+    Creates (stale) suggestion rows for users that don't have one yet.
+    """
+    created = 0
+    missing = User.objects.filter(suggestions__isnull=True).order_by('pk').values_list('pk', flat=True)
+    batch = []
+    for pk in missing.iterator(chunk_size=batch_size):
+        batch.append(UserSuggestions(user_id=pk))
+        if len(batch) >= batch_size:
+            UserSuggestions.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+            batch = []
+    if batch:
+        UserSuggestions.objects.bulk_create(batch, ignore_conflicts=True)
+        created += len(batch)
+    return created
+
+
+def apply_suggestion_changes(batch_size=1000):
+    """
+    Marks stale everyone affected by the follow and membership changes
+    recorded since the last run: the followers of each changed user and the
+    members of each changed group. Returns the number of changes applied.
+    """
+    applied = 0
+    Membership = Group.members.through
+    while True:
+        batch = list(SuggestionChange.objects.order_by('pk').values_list('pk', 'user_id', 'group_id')[:batch_size])
+        if not batch:
+            break
+        user_ids = {user_id for _, user_id, _ in batch if user_id is not None}
+        group_ids = {group_id for _, _, group_id in batch if group_id is not None}
+        if user_ids:
+            followers = Follow.objects.filter(following_id__in=user_ids).values('follower_id')
+            UserSuggestions.objects.filter(user__in=followers).update(is_stale=True)
+        if group_ids:
+            members = Membership.objects.filter(group_id__in=group_ids).values('user_id')
+            UserSuggestions.objects.filter(user__in=members).update(is_stale=True)
+        SuggestionChange.objects.filter(pk__in=[pk for pk, _, _ in batch]).delete()
+        applied += len(batch)
+    return applied
+
+
+def refresh_stale_suggestions(batch_size=200, limit=None):
+    """
+    Recomputes stale suggestion rows, `batch_size` users at a time.
+    Returns the number of users processed.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - processed)
+        batch = list(
+            UserSuggestions.objects.filter(is_stale=True)
+            .select_related('user')
+            .order_by('pk')[:size]
+        )
+        if not batch:
+            break
+
+        # Clear the flag before computing: a follow that lands meanwhile sets
+        # it again and the user is simply picked up by the next run.
+        UserSuggestions.objects.filter(pk__in=[row.pk for row in batch]).update(is_stale=False)
+        now = timezone.now()
+        for row in batch:
+            row.candidates = compute_candidates(row.user)
+            row.computed_at = now
+        UserSuggestions.objects.bulk_update(batch, ['candidates', 'computed_at'])
+        processed += len(batch)
+    return processed
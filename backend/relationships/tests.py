@@ -1,3 +1,131 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from groups.models import Group
+
+from .models import Follow, SuggestionChange, UserSuggestions
+from .suggestions import apply_suggestion_changes
+
+User = get_user_model()
+
+
+class FollowTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', email='alice@iitb.ac.in', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@iitb.ac.in', password='pw')
+        self.carol = User.objects.create_user(username='carol', email='carol@iitb.ac.in', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_follow_and_unfollow_keep_counters_in_sync(self):
+        self.assertEqual(self.client.post('/api/follow/bob/').status_code, 201)
+        self.assertEqual(self.client.post('/api/follow/bob/').status_code, 400)
+        self.alice.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual((self.alice.following_count, self.bob.followers_count), (1, 1))
+
+        self.assertEqual(self.client.delete('/api/follow/bob/').status_code, 204)
+        self.assertEqual(self.client.delete('/api/follow/bob/').status_code, 404)
+        self.alice.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual((self.alice.following_count, self.bob.followers_count), (0, 0))
+
+    def test_followers_list_flags_who_the_viewer_follows(self):
+        Follow.objects.create(follower=self.bob, following=self.carol)
+        Follow.objects.create(follower=self.alice, following=self.carol)
+        Follow.objects.create(follower=self.alice, following=self.bob)
+
+        with self.assertNumQueries(3):  # profile owner, page, viewer's follows
+            response = self.client.get('/api/users/carol/followers/')
+        self.assertEqual(response.status_code, 200)
+        rows = {row['username']: row['is_following'] for row in response.data['results']}
+        self.assertEqual(rows, {'alice': False, 'bob': True})
+
+        response = self.client.get('/api/users/alice/following/')
+        self.assertEqual([row['username'] for row in response.data['results']], ['bob', 'carol'])
+
+
+class RelationshipStatusTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', email='alice@iitb.ac.in', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@iitb.ac.in', password='pw')
+        self.carol = User.objects.create_user(username='carol', email='carol@iitb.ac.in', password='pw')
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        Follow.objects.create(follower=self.carol, following=self.alice)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_batch_status_by_username_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/relationships/status/?usernames=bob,carol,nobody')
+        self.assertEqual(response.data['results'], {
+            'bob': {'following': True, 'followed_by': True, 'mutual': True},
+            'carol': {'following': False, 'followed_by': True, 'mutual': False},
+            'nobody': {'following': False, 'followed_by': False, 'mutual': False},
+        })
+
+    def test_batch_status_by_id_and_limits(self):
+        response = self.client.post('/api/relationships/status/', {'ids': [self.bob.pk]}, format='json')
+        self.assertTrue(response.data['results'][self.bob.pk]['mutual'])
+
+        too_many = list(range(1, 400))
+        response = self.client.post('/api/relationships/status/', {'ids': too_many}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_results_can_include_flags(self):
+        response = self.client.get('/api/users/?search=bob&relationship=1')
+        self.assertEqual(response.data[0]['relationship']['mutual'], True)
+
+
+class SuggestionTests(TestCase):
+    def test_ranks_friends_of_friends_groups_and_college(self):
+        me = User.objects.create_user(username='me', email='me@iitb.ac.in', password='pw')
+        friend = User.objects.create_user(username='friend', email='friend@nitt.edu.in', password='pw')
+        fof = User.objects.create_user(username='fof', email='fof@nitt.edu.in', password='pw')
+        classmate = User.objects.create_user(username='classmate', email='classmate@nitt.edu.in', password='pw')
+        campus = User.objects.create_user(username='campus', email='campus@iitb.ac.in', password='pw')
+        Follow.objects.create(follower=me, following=friend)
+        Follow.objects.create(follower=friend, following=fof)
+        group = Group.objects.create(name='Robotics', owner=classmate)
+        group.members.add(me, classmate)
+
+        call_command('compute_suggestions', stdout=StringIO())
+
+        client = APIClient()
+        client.force_authenticate(me)
+        with self.assertNumQueries(3):
+            response = client.get('/api/suggestions/')
+        self.assertEqual([row['username'] for row in response.data['results']], ['fof', 'classmate', 'campus'])
+        self.assertEqual(response.data['results'][0]['mutual_follows'], 1)
+        self.assertTrue(response.data['results'][2]['same_college'])
+
+        # Following someone marks the list stale and hides them right away.
+        client.post('/api/follow/fof/')
+        self.assertTrue(UserSuggestions.objects.get(user=me).is_stale)
+        response = client.get('/api/suggestions/')
+        self.assertNotIn('fof', [row['username'] for row in response.data['results']])
+
+    def test_fan_out_is_left_to_the_background_job(self):
+        me = User.objects.create_user(username='me', email='me@iitb.ac.in', password='pw')
+        friend = User.objects.create_user(username='friend', email='friend@iitb.ac.in', password='pw')
+        other = User.objects.create_user(username='other', email='other@iitb.ac.in', password='pw')
+        Follow.objects.create(follower=me, following=friend)
+        group = Group.objects.create(name='Robotics', owner=other)
+        group.members.add(me)
+        call_command('compute_suggestions', stdout=StringIO())
+        self.assertFalse(UserSuggestions.objects.filter(is_stale=True).exists())
+
+        # One row marked (the follower's own) and one change recorded, however many followers
+        Follow.objects.create(follower=friend, following=other)
+        group.members.add(other)
+        self.assertEqual(set(UserSuggestions.objects.filter(is_stale=True).values_list('user_id', flat=True)), {friend.pk, other.pk})
+        self.assertEqual(SuggestionChange.objects.count(), 2)
 
-# Create your tests here.
+        self.assertEqual(apply_suggestion_changes(), 2)
+        self.assertTrue(UserSuggestions.objects.get(user=me).is_stale)
+        self.assertFalse(SuggestionChange.objects.exists())
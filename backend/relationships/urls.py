@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import FollowView
+from .views import FollowView, FollowersListView, FollowingListView, RelationshipStatusView, SuggestionsView
 
 urlpatterns = [
     path('follow/<str:username>/', FollowView.as_view(), name='follow-user'),
+    path('suggestions/', SuggestionsView.as_view(), name='user-suggestions'),
+    path('relationships/status/', RelationshipStatusView.as_view(), name='relationship-status'),
+    path('users/<str:username>/followers/', FollowersListView.as_view(), name='user-followers'),
+    path('users/<str:username>/following/', FollowingListView.as_view(), name='user-following'),
 ]
\ No newline at end of file
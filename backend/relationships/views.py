@@ -1,8 +1,18 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from rest_framework import generics, status
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from .models import Follow
+from notifications.buffer import notify
+from notifications.models import Notification
+from users.colleges import requested_college
+from .models import Follow, UserSuggestions
+from .serializers import FollowUserSerializer, SuggestedUserSerializer
 
 User = get_user_model()
 
@@ -15,15 +25,150 @@ class FollowView(generics.GenericAPIView):
         if user_to_follow == request.user:
             return Response({"detail": "You cannot follow yourself."}, status=status.HTTP_400_BAD_REQUEST)
 
-        follow, created = Follow.objects.get_or_create(follower=request.user, following=user_to_follow)
-        if not created:
-            return Response({"detail": "You are already following this user."}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            follow, created = Follow.objects.get_or_create(follower=request.user, following=user_to_follow)
+            if not created:
+                return Response({"detail": "You are already following this user."}, status=status.HTTP_400_BAD_REQUEST)
+
+            User.objects.filter(pk=request.user.pk).update(following_count=F('following_count') + 1)
+            User.objects.filter(pk=user_to_follow.pk).update(followers_count=F('followers_count') + 1)
+            notify(user_to_follow.pk, Notification.FOLLOW, request.user.pk)
 
         return Response({"detail": f"You are now following {username}."}, status=status.HTTP_201_CREATED)
 
     def delete(self, request, username, *args, **kwargs):
         """Unfollow a user."""
         user_to_unfollow = get_object_or_404(User, username=username)
-        follow = get_object_or_404(Follow, follower=request.user, following=user_to_unfollow)
-        follow.delete()
-        return Response({"detail": f"You have unfollowed {username}."}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=request.user, following=user_to_unfollow).delete()
+            if not deleted:
+                raise Http404("You are not following this user.")
+
+            User.objects.filter(pk=request.user.pk, following_count__gt=0).update(following_count=F('following_count') - 1)
+            User.objects.filter(pk=user_to_unfollow.pk, followers_count__gt=0).update(followers_count=F('followers_count') - 1)
+
+        return Response({"detail": f"You have unfollowed {username}."}, status=status.HTTP_204_NO_CONTENT)
+
+
+class RelationshipStatusView(generics.GenericAPIView):
+    """
+    Follow / followed-by / mutual flags between the current user and up to
+    RELATIONSHIP_STATUS_MAX_USERS other users, in one query.
+
+    GET  ?usernames=a,b,c  or  ?ids=1,2,3
+    POST {"usernames": [...]}  or  {"ids": [...]}  for longer lists
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        params = {
+            name: [value for value in request.query_params.get(name, '').split(',') if value]
+            for name in ('usernames', 'ids')
+        }
+        return self.status_response(params)
+
+    def post(self, request, *args, **kwargs):
+        return self.status_response(request.data)
+
+    def status_response(self, data):
+        usernames = data.get('usernames') or []
+        ids = data.get('ids') or []
+        if bool(usernames) == bool(ids):
+            return Response({'error': 'Provide either usernames or ids.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        keys = usernames or ids
+        limit = settings.RELATIONSHIP_STATUS_MAX_USERS
+        if not isinstance(keys, list) or len(keys) > limit:
+            return Response({'error': f'Provide a list of at most {limit} users.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if ids:
+            try:
+                keys = [int(pk) for pk in ids]
+            except (TypeError, ValueError):
+                return Response({'error': 'ids must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+            results = Follow.objects.status_for(self.request.user, keys)
+        else:
+            results = Follow.objects.status_for(self.request.user, [str(name) for name in keys], key='username')
+        return Response({'results': results})
+
+
+class FollowListPagination(CursorPagination):
+    page_size = 30
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    ordering = '-created_at'
+
+
+class BaseFollowListView(generics.ListAPIView):
+    """
+    Paginated list of the users on one side of another user's follows.
+    `user_field` is the Follow field to list, `lookup_field` the one that
+    matches the profile owner.
+    """
+    serializer_class = FollowUserSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = FollowListPagination
+    user_field = None
+    lookup_field = None
+
+    def get_queryset(self):
+        profile = get_object_or_404(User, username=self.kwargs['username'])
+        return Follow.objects.filter(**{self.lookup_field: profile}).select_related(self.user_field)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        users = [getattr(follow, self.user_field) for follow in page]
+
+        context = self.get_serializer_context()
+        context['following_ids'] = Follow.objects.following_ids(request.user, [user.pk for user in users])
+        serializer = self.get_serializer_class()(users, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
+
+class FollowersListView(BaseFollowListView):
+    """Users who follow `username`."""
+    user_field = 'follower'
+    lookup_field = 'following'
+
+
+class FollowingListView(BaseFollowListView):
+    """Users `username` follows."""
+    user_field = 'following'
+    lookup_field = 'follower'
+
+
+class SuggestionsView(generics.GenericAPIView):
+    """
+    "People you may know", read from the list precomputed by the
+    compute_suggestions command. No graph queries run here: one read for the
+    stored list, one to drop people followed since, one for the user rows.
+    """
+    serializer_class = SuggestedUserSerializer
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', self.default_limit)), 50))
+        except ValueError:
+            limit = self.default_limit
+
+        stored = UserSuggestions.objects.filter(user=request.user).values_list('candidates', flat=True).first()
+        if stored is None:
+            # First visit: queue this user for the next compute_suggestions run.
+            UserSuggestions.objects.get_or_create(user=request.user)
+            return Response({'results': []})
+
+        details = {row[0]: row for row in stored}
+        college = requested_college(request)
+        if college is not None:
+            # ?college=mine or ?college=<domain>
+            on_campus = set(User.objects.filter(pk__in=list(details), college_domain=college).values_list('pk', flat=True))
+            details = {pk: row for pk, row in details.items() if pk in on_campus}
+        followed = Follow.objects.following_ids(request.user, list(details))
+        wanted = [pk for pk in details if pk not in followed][:limit]
+        users = User.objects.in_bulk(wanted)
+
+        context = {**self.get_serializer_context(), 'details': details}
+        serializer = self.get_serializer_class()([users[pk] for pk in wanted if pk in users], many=True, context=context)
+        return Response({'results': serializer.data})
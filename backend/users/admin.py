@@ -1,3 +1,19 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from core.admin import ScalableModelAdmin
+from .models import User
 
-# Register your models here.
+
+@admin.register(User)
+class UserAdmin(ScalableModelAdmin, BaseUserAdmin):
+    list_display = ('username', 'email', 'date_joined', 'followers_count', 'is_staff', 'pending_deletion')
+    list_filter = ('is_staff', 'is_active')
+    # Exact, case-insensitive matches, served by the UPPER() indexes on User
+    search_fields = ('=username', '=email')
+    date_hierarchy = 'date_joined'
+    ordering = ('-date_joined',)
+    readonly_fields = ('followers_count', 'following_count', 'profile_photo_variants', 'deletion_requested_at')
+    fieldsets = BaseUserAdmin.fieldsets + (
+        ('Profile', {'fields': ('bio', 'date_of_birth', 'profile_photo', 'profile_photo_variants')}),
+        ('Stats', {'fields': ('followers_count', 'following_count', 'deletion_requested_at')}),
+    )
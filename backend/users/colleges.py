@@ -0,0 +1,49 @@
+# backend/users/colleges.py
+"""
+College (campus) domains, stored on User.college_domain and
+Group.college_domain so "people/groups at my college" is an indexed
+equality lookup instead of a LIKE scan over emails.
+"""
+
+ACADEMIC_SUFFIXES = ('.ac.in', '.edu.in')
+
+
+def college_domain(email):
+    """
+    The institution's domain for an academic email address, with
+    department/hostel subdomains folded in:
+    'Student@CSE.IITB.ac.in' -> 'iitb.ac.in'. '' for anything else.
+    """
+    if not email or '@' not in email:
+        return ''
+    domain = email.rsplit('@', 1)[1].strip().lower().rstrip('.')
+    for suffix in ACADEMIC_SUFFIXES:
+        if domain.endswith(suffix):
+            institution = domain[:-len(suffix)].rsplit('.', 1)[-1]
+            return institution + suffix if institution else ''
+    return ''
+
+
+def requested_college(request):
+    """
+    The campus asked for with ?college=: a domain, or 'mine' for the
+    signed-in user's own. None when there's no filter; anything that
+    isn't an academic domain is a ValidationError (400), rather than an
+    unfiltered list.
+    """
+    from rest_framework.exceptions import ValidationError
+
+    value = request.query_params.get('college', '').strip().lower()
+    if not value:
+        return None
+    if value == 'mine':
+        user = request.user
+        if not user.is_authenticated:
+            raise ValidationError({'college': "Sign in to filter by your own college."})
+        if not user.college_domain:
+            raise ValidationError({'college': "Your account has no college email."})
+        return user.college_domain
+    domain = college_domain(f'x@{value}')
+    if not domain:
+        raise ValidationError({'college': f"'{value}' is not a college domain (.ac.in or .edu.in)."})
+    return domain
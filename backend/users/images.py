@@ -0,0 +1,190 @@
+# backend/users/images.py
+
+import hashlib
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+# Pillow is imported where it's used: only uploads need it, and leaving it
+# out of startup keeps worker boot fast (see `manage.py profile_imports`).
+
+# Square avatar sizes (px) handed out by the API. 'small' is what feeds and
+# search results use, 'large' is the profile page header.
+AVATAR_SIZES = {
+    'small': 64,
+    'medium': 160,
+    'large': 400,
+}
+
+# WebP first: it's what the serializers hand out, JPEG is kept as a fallback
+# for clients that can't decode it.
+AVATAR_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+AVATAR_UPLOAD_DIR = 'profile_photos'
+
+
+class InvalidImageError(ValueError):
+    """The upload isn't an image Pillow can decode."""
+
+
+def _square(image, size):
+    """
+    Center-crops `image` to a square and downsamples it to `size` x `size`.
+    """
+    from PIL import Image, ImageOps
+
+    return ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+
+
+def _save_variant(image, ext, options):
+    buffer = io.BytesIO()
+    # Re-encoding without passing exif= drops every EXIF tag (GPS, camera...).
+    image.save(buffer, **options)
+    data = buffer.getvalue()
+
+    # The name is derived from the bytes, so a given URL never changes content
+    # and can be cached forever. ContentAddressedStorage renames it to its own
+    # hash and skips the write when the same bytes are already stored.
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    return default_storage.save(os.path.join(AVATAR_UPLOAD_DIR, f'{digest}.{ext}'), ContentFile(data))
+
+
+def build_avatar_variants(source):
+    """
+    Reads an uploaded image file and returns a dict of stored variant names:
+    {'small': {'webp': ..., 'jpeg': ...}, 'medium': {...}, 'large': {...}}
+    Raises InvalidImageError for anything Pillow can't decode.
+    """
+    from PIL import Image
+
+    source.seek(0)
+    try:
+        return _build_variants(source)
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        # UnidentifiedImageError and truncated files are OSErrors
+        raise InvalidImageError(str(e)) from e
+
+
+def _build_variants(source):
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # Let the JPEG decoder do most of the downscaling for us.
+        largest = max(AVATAR_SIZES.values())
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        variants = {}
+        for label, size in AVATAR_SIZES.items():
+            resized = _square(image, size)
+            variants[label] = {
+                ext: _save_variant(resized, ext, options)
+                for ext, options in AVATAR_FORMATS.items()
+            }
+    return variants
+
+
+def variant_key(size, fmt):
+    """
+    Lookup path of one variant inside profile_photo_variants, e.g.
+    'profile_photo_variants__small__webp'. Each has an index (see User.Meta).
+    """
+    return f'profile_photo_variants__{size}__{fmt}'
+
+
+def variant_names(variants):
+    return {name for formats in (variants or {}).values() for name in formats.values()}
+
+
+def _referenced(names, user):
+    """
+    Which of the stored files `names` another account still uses: identical
+    bytes share one name under ContentAddressedStorage. One query, every
+    branch of it on an indexed column or expression.
+    """
+    from django.db import router
+    from django.db.models import Q, Value
+    from django.db.models.fields.json import KT
+    from django.db.models.lookups import Exact
+
+    model = type(user)
+    others = model._base_manager.using(router.db_for_write(model)).exclude(pk=user.pk)
+    keys = [KT(variant_key(size, fmt)) for size in AVATAR_SIZES for fmt in AVATAR_FORMATS]
+    condition = Q(profile_photo__in=names)
+    for key in keys:
+        # Plain text comparisons, the same expressions as the indexes. A
+        # key__in= lookup would compare against JSON-encoded values instead.
+        for name in names:
+            condition |= Exact(key, Value(name))
+    referenced = set()
+    for row in others.filter(condition).values_list('profile_photo', *keys):
+        referenced.update(row)
+    return referenced & set(names)
+
+
+def release_photos(names, user):
+    """
+    Deletes the stored files `names` that no other account references.
+    """
+    names = {name for name in names if name}
+    if not names:
+        return
+    for name in names - _referenced(names, user):
+        default_storage.delete(name)
+
+
+def process_profile_photo(user, save=True, variants=None):
+    """
+    Replaces the user's profile photo with EXIF-stripped, resized,
+    content-hashed variants.
+
+    `profile_photo` ends up pointing at the large JPEG so older clients
+    keep working, and the full set lives in `profile_photo_variants`. A
+    fresh upload (not saved yet) is never written to storage at all; an
+    already stored original and the previous variants are deleted once the
+    change commits, unless another account shares them. With save=False
+    the caller must save inside a transaction, or they'd be deleted first.
+    `variants` reuses a set already built from the same original.
+    Raises InvalidImageError when the photo can't be decoded.
+    """
+    photo = user.profile_photo
+    replaced = variant_names(user.profile_photo_variants)
+    if not photo:
+        user.profile_photo_variants = {}
+    else:
+        # Don't keep the raw upload around, it still carries its EXIF data.
+        if photo._committed:
+            replaced.add(photo.name)
+        if variants is None:
+            with photo.open('rb') as source:
+                variants = build_avatar_variants(source)
+        user.profile_photo_variants = variants
+        user.profile_photo = variants['large']['jpeg']
+    replaced -= variant_names(user.profile_photo_variants)
+
+    if save:
+        user.save(update_fields=['profile_photo', 'profile_photo_variants'])
+    if replaced:
+        transaction.on_commit(lambda: release_photos(replaced, user))
+    return user
+
+
+def avatar_name(user, size='small', fmt='webp'):
+    """
+    Storage name of the best avatar for `size`, falling back to the JPEG
+    variant and finally to the raw upload for unprocessed photos.
+    """
+    variants = (user.profile_photo_variants or {}).get(size)
+    if variants:
+        return variants.get(fmt) or variants.get('jpeg')
+    if user.profile_photo:
+        return user.profile_photo.name
+    return None
@@ -0,0 +1,42 @@
+# backend/users/management/commands/process_profile_photos.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.db_router import use_primary
+from users.images import process_profile_photo
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Backfills resized, EXIF-stripped avatar variants for existing profile photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Reprocess photos that already have variants.")
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    @use_primary()
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_photo='').exclude(profile_photo__isnull=True)
+        if not options['force']:
+            users = users.filter(profile_photo_variants={})
+
+        # Ordered by original, so accounts sharing one (same bytes, same
+        # content-addressed name) are resized once, and the original is only
+        # deleted after the last of them moved to the variants.
+        processed = failed = 0
+        original = variants = None
+        for user in users.order_by('profile_photo', 'pk').iterator(chunk_size=options['batch_size']):
+            if user.profile_photo.name != original:
+                original, variants = user.profile_photo.name, None
+            try:
+                process_profile_photo(user, variants=variants)
+            except (OSError, ValueError) as e:
+                failed += 1
+                self.stderr.write(f"Could not process photo for {user.username}: {e}")
+                continue
+            variants = user.profile_photo_variants
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} profile photos ({failed} failed)."))
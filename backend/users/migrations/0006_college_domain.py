@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+from users.colleges import college_domain
+
+
+def backfill_college_domain(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    batch = []
+    for user in User.objects.only('pk', 'email').order_by('pk').iterator(chunk_size=2000):
+        user.college_domain = college_domain(user.email)
+        if user.college_domain:
+            batch.append(user)
+        if len(batch) >= 2000:
+            User.objects.bulk_update(batch, ['college_domain'])
+            batch = []
+    User.objects.bulk_update(batch, ['college_domain'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0005_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='college_domain',
+            field=models.CharField(blank=True, default='', editable=False, max_length=253),
+        ),
+        migrations.RunPython(backfill_college_domain, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['college_domain', '-date_joined'], name='user_college_joined_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-19 15:01
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0006_college_domain'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['profile_photo'], name='user_profile_photo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('webp', django.db.models.fields.json.KeyTextTransform('small', 'profile_photo_variants')), name='user_photo_small_webp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('jpeg', django.db.models.fields.json.KeyTextTransform('small', 'profile_photo_variants')), name='user_photo_small_jpeg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('webp', django.db.models.fields.json.KeyTextTransform('medium', 'profile_photo_variants')), name='user_photo_medium_webp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('jpeg', django.db.models.fields.json.KeyTextTransform('medium', 'profile_photo_variants')), name='user_photo_medium_jpeg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('webp', django.db.models.fields.json.KeyTextTransform('large', 'profile_photo_variants')), name='user_photo_large_webp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.fields.json.KeyTextTransform('jpeg', django.db.models.fields.json.KeyTextTransform('large', 'profile_photo_variants')), name='user_photo_large_jpeg_idx'),
+        ),
+    ]
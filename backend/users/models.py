@@ -1,15 +1,61 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models.fields.json import KT
+from django.db.models.functions import Upper
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+from core.deletion import PendingDeleteModel, PendingDeleteQuerySet, VisibleManagerMixin, pending_index
+from .colleges import college_domain
+from .images import AVATAR_FORMATS, AVATAR_SIZES, variant_key
 
-class User(AbstractUser):
+
+class UserManager(VisibleManagerMixin, BaseUserManager.from_queryset(PendingDeleteQuerySet)):
+    """
+    Default manager: accounts pending deletion can't be found or log in.
+    """
+
+
+class User(AbstractUser, PendingDeleteModel):
     email = models.EmailField(unique=True)
+    # Derived from email in save(), e.g. 'iitb.ac.in' (see users/colleges.py)
+    college_domain = models.CharField(max_length=253, blank=True, default='', editable=False)
     bio = models.TextField(blank=True, null=True)
     profile_photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True)
+    # Resized avatars produced by users.images.process_profile_photo
+    profile_photo_variants = models.JSONField(default=dict, blank=True)
     date_of_birth = models.DateField(blank=True, null=True)
+    # Denormalized from relationships.Follow, kept up to date by FollowView
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
 
     # We use email as the unique identifier for login instead of username
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    objects = UserManager()
+    all_objects = BaseUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            pending_index('user_pending_delete_idx'),
+            # Case-insensitive exact lookups (admin search, autocomplete)
+            models.Index(Upper('username'), name='user_username_upper_idx'),
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+            # Campus filters, newest members first
+            models.Index(fields=['college_domain', '-date_joined'], name='user_college_joined_idx'),
+            # Whether a stored photo is still in use before it's deleted (users/images.py)
+            models.Index(fields=['profile_photo'], name='user_profile_photo_idx'),
+            *[
+                models.Index(KT(variant_key(size, fmt)), name=f'user_photo_{size}_{fmt}_idx')
+                for size in AVATAR_SIZES for fmt in AVATAR_FORMATS
+            ],
+        ]
+
+    def save(self, *args, **kwargs):
+        self.college_domain = college_domain(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'college_domain'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.email
\ No newline at end of file
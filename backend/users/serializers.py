@@ -1,27 +1,100 @@
 # backend/users/serializers.py
 
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import transaction
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer, UserSerializer as BaseUserSerializer
+from rest_framework import serializers
+
+from core.serializers import PendingAwareUniqueMixin
+from .images import InvalidImageError, avatar_name, process_profile_photo
 
 User = get_user_model()
 
-class UserCreateSerializer(BaseUserCreateSerializer):
+
+class AvatarField(serializers.Field):
+    """
+    Read-only URL of a user's avatar at a given size ('small', 'medium' or
+    'large'). Feeds and lists use 'small' so they don't pull full-size photos.
+    """
+    def __init__(self, size='small', fmt='webp', **kwargs):
+        self.size = size
+        self.fmt = fmt
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', '*')
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        name = avatar_name(user, self.size, self.fmt)
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get('request', None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+def process_uploaded_photo(user, save=True):
+    try:
+        process_profile_photo(user, save=save)
+    except InvalidImageError:
+        raise serializers.ValidationError({'profile_photo': ['Upload a valid image. The file could not be read.']})
+
+
+class UserCreateSerializer(PendingAwareUniqueMixin, BaseUserCreateSerializer):
     class Meta(BaseUserCreateSerializer.Meta):
         model = User
         # Ensure 'email' and 'password' are included, add others as needed
         fields = ('id', 'email', 'username', 'password', 'bio', 'profile_photo', 'date_of_birth')
 
-class UserSerializer(BaseUserSerializer):
+    def create(self, validated_data):
+        photo = validated_data.pop('profile_photo', None)
+        with transaction.atomic():
+            user = super().create(validated_data)
+            if photo:
+                user.profile_photo = photo
+                process_uploaded_photo(user)
+        return user
+
+class UserSerializer(PendingAwareUniqueMixin, BaseUserSerializer):
+    profile_photo_thumbnail = AvatarField(size='small')
+
     class Meta(BaseUserSerializer.Meta):
         model = User
         # Fields visible when viewing/editing profile
-        fields = ('id', 'email', 'username', 'bio', 'profile_photo', 'date_of_birth')
+        fields = ('id', 'email', 'username', 'bio', 'profile_photo', 'profile_photo_thumbnail', 'date_of_birth',
+                  'college_domain', 'followers_count', 'following_count')
         # Prevent changing email via this serializer (optional, good practice)
-        read_only_fields = ('email',)
+        read_only_fields = ('email', 'college_domain', 'followers_count', 'following_count')
+
+    def update(self, instance, validated_data):
+        if 'profile_photo' not in validated_data:
+            return super().update(instance, validated_data)
+        # Resized before saving, so a photo that can't be decoded is a 400
+        # and the raw upload never reaches storage. Atomic: the old files are
+        # only deleted once the new names are committed.
+        with transaction.atomic():
+            instance.profile_photo = validated_data.pop('profile_photo')
+            process_uploaded_photo(instance, save=False)
+            return super().update(instance, validated_data)
+
+class UserSearchSerializer(UserSerializer):
+    """
+    UserSerializer plus the requester's follow flags, filled in by
+    UserListView when the client asks for them with ?relationship=1.
+    """
+    relationship = serializers.SerializerMethodField()
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ('relationship',)
+
+    def get_relationship(self, obj):
+        return self.context.get('relationships', {}).get(obj.pk)
 
 # This was your previous serializer, ensure it matches or adapt UserSerializer above
 # class UserProfileSerializer(BaseUserSerializer):
 #     class Meta(BaseUserSerializer.Meta):
 #         model = User
 #         fields = ('id', 'username', 'email', 'bio', 'profile_photo')
-#         read_only_fields = ('email',)
\ No newline at end of file
+#         read_only_fields = ('email',)
@@ -1,3 +1,154 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from groups.models import Group
+from .colleges import college_domain
+from .images import AVATAR_FORMATS, AVATAR_SIZES, InvalidImageError, build_avatar_variants, process_profile_photo
+
+User = get_user_model()
+
+
+class CollegeDomainTests(SimpleTestCase):
+    def test_normalizes_to_the_institution(self):
+        self.assertEqual(college_domain('Student@CSE.IITB.ac.in'), 'iitb.ac.in')
+        self.assertEqual(college_domain('a@nitt.edu.in'), 'nitt.edu.in')
+        self.assertEqual(college_domain('a@gmail.com'), '')
+        self.assertEqual(college_domain('a@.ac.in'), '')
+
+
+class CampusFilterTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user(username='me', email='me@cse.iitb.ac.in', password='pw')
+        self.classmate = User.objects.create_user(username='classmate', email='classmate@iitb.ac.in', password='pw')
+        other = User.objects.create_user(username='other', email='other@nitt.edu.in', password='pw')
+        self.group = Group.objects.create(name='Robotics', owner=self.classmate)
+        Group.objects.create(name='Chess', owner=other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def test_column_follows_email(self):
+        self.assertEqual(self.me.college_domain, 'iitb.ac.in')
+        self.me.email = 'me@nitt.edu.in'
+        self.me.save(update_fields=['email'])
+        self.assertEqual(User.objects.get(pk=self.me.pk).college_domain, 'nitt.edu.in')
+
+    def test_users_and_groups_filter_by_campus(self):
+        response = self.client.get('/api/users/', {'college': 'mine'})
+        self.assertEqual(sorted(user['username'] for user in response.data), ['classmate', 'me'])
+        response = self.client.get('/api/users/', {'college': 'nitt.edu.in'})
+        self.assertEqual([user['username'] for user in response.data], ['other'])
+
+        response = self.client.get('/api/groups/', {'college': 'mine'})
+        self.assertEqual([group['name'] for group in response.data], ['Robotics'])
+
+    def test_unusable_college_filters_are_a_400(self):
+        for params in ({'college': 'gmail.com'}, {'college': '.ac.in'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/users/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('college', response.data)
+        response = APIClient().get('/api/groups/', {'college': 'mine'})
+        self.assertEqual(response.status_code, 400)
+
+
+def make_photo(size=(400, 300), color='red'):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'  # Make
+    Image.new('RGB', size, color).save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile('me.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+class ProfilePhotoTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.me = User.objects.create_user(username='me', email='me@iitb.ac.in', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def upload(self, photo):
+        return self.client.patch('/api/auth/users/me/', {'profile_photo': photo}, format='multipart')
+
+    def test_upload_is_replaced_by_stripped_variants(self):
+        from PIL import Image
+
+        response = self.upload(make_photo())
+        self.assertEqual(response.status_code, 200)
+        self.me.refresh_from_db()
+        variants = self.me.profile_photo_variants
+        self.assertEqual(set(variants), set(AVATAR_SIZES))
+        for size, px in AVATAR_SIZES.items():
+            self.assertEqual(set(variants[size]), set(AVATAR_FORMATS))
+            for name in variants[size].values():
+                with default_storage.open(name) as f, Image.open(f) as image:
+                    self.assertEqual(image.size, (px, px))
+                    self.assertFalse(image.getexif())
+        self.assertEqual(self.me.profile_photo.name, variants['large']['jpeg'])
+        # Only the variants are stored, not the raw upload
+        stored = {name for formats in variants.values() for name in formats.values()}
+        self.assertEqual({f'profile_photos/{name}' for name in default_storage.listdir('profile_photos')[1]}, stored)
+
+        self.assertTrue(response.data['profile_photo_thumbnail'].endswith(variants['small']['webp']))
+
+    def test_unreadable_upload_is_rejected(self):
+        # Passes the upload field's header check, fails once decoded
+        data = make_photo(size=(1200, 900)).read()
+        truncated = SimpleUploadedFile('me.jpg', data[:len(data) // 2], content_type='image/jpeg')
+        response = self.upload(truncated)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['profile_photo'], ['Upload a valid image. The file could not be read.'])
+        self.me.refresh_from_db()
+        self.assertFalse(self.me.profile_photo)
+
+        with self.assertRaises(InvalidImageError):
+            build_avatar_variants(io.BytesIO(b'GIF89a not an image'))
+
+    def test_shared_original_is_kept_while_referenced(self):
+        photo = make_photo()
+        name = default_storage.save('profile_photos/original.jpg', photo)
+        self.me.profile_photo = name
+        self.me.save()
+        User.objects.create_user(username='twin', email='twin@iitb.ac.in', password='pw', profile_photo=name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            process_profile_photo(self.me)
+        self.assertTrue(default_storage.exists(name))
+
+        twin = User.objects.get(username='twin')
+        with self.captureOnCommitCallbacks(execute=True):
+            process_profile_photo(twin)
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(twin.profile_photo_variants, User.objects.get(pk=self.me.pk).profile_photo_variants)
+
+    def test_previous_variants_are_deleted_on_reupload(self):
+        self.assertEqual(self.upload(make_photo(color='red')).status_code, 200)
+        self.me.refresh_from_db()
+        red = self.me.profile_photo_variants
+        twin = User.objects.create_user(username='twin', email='twin@iitb.ac.in', password='pw')
+        User.objects.filter(pk=twin.pk).update(profile_photo=self.me.profile_photo.name, profile_photo_variants=red)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.upload(make_photo(color='blue')).status_code, 200)
+        # Still in use by the twin
+        self.assertTrue(all(default_storage.exists(name) for formats in red.values() for name in formats.values()))
+
+        twin.refresh_from_db()
+        twin.profile_photo = None
+        with self.captureOnCommitCallbacks(execute=True):
+            process_profile_photo(twin)
+        self.assertFalse(any(default_storage.exists(name) for formats in red.values() for name in formats.values()))
+        self.me.refresh_from_db()
+        self.assertTrue(default_storage.exists(self.me.profile_photo.name))
@@ -1,13 +1,17 @@
 # backend/users/views.py
 import random
-from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework import generics, status, views, filters
+from django.db import router
+from rest_framework import generics, serializers, status, views, filters
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from core.database import statement_timeout
+from core.throttling import EmailDomainTokenBucketThrottle, IPTokenBucketThrottle, UserTokenBucketThrottle
+from relationships.models import Follow
 # ***** CHANGE IMPORT HERE *****
-from .serializers import UserSerializer # Use the correct serializer name
+from .serializers import UserSerializer, UserSearchSerializer # Use the correct serializer name
+from .colleges import college_domain, requested_college
 User = get_user_model()
 
 # --- Custom JWT Classes (Keep these from previous step) ---
@@ -31,6 +35,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    # Password hashing is deliberately slow, cap attempts per client. Not per
+    # email domain: one client could then lock a whole campus out.
+    throttle_scope = 'login'
+    throttle_classes = [IPTokenBucketThrottle]
 
 # --- Existing functions/classes below (is_indian_college_email, RegistrationView, VerificationView) ---
 # --- Make sure they remain as they were ---
@@ -38,7 +46,8 @@ def is_indian_college_email(email):
     """
     A simple check for common Indian academic domains.
     """
-    return email.endswith('.ac.in') or email.endswith('.edu.in')
+    # Same rule that fills User.college_domain, so every account gets a campus
+    return bool(college_domain(email))
 
 class RegistrationView(views.APIView):
     """
@@ -46,6 +55,9 @@ class RegistrationView(views.APIView):
     sending OTP, and storing data in the session.
     """
     permission_classes = [AllowAny] # Allow public access
+    # Every accepted request sends an email over SMTP
+    throttle_scope = 'register'
+    throttle_classes = [IPTokenBucketThrottle, EmailDomainTokenBucketThrottle]
 
     def post(self, request, *args, **kwargs):
         email = request.data.get('email')
@@ -57,12 +69,21 @@ class RegistrationView(views.APIView):
         if not is_indian_college_email(email):
             return Response({'error': 'Please use a valid Indian college email address (.ac.in or .edu.in).'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if User.objects.filter(email=email).exists():
+        # all_objects: an account pending deletion still holds its email until it's purged
+        existing = User.all_objects.filter(email=email).only('deletion_requested_at').first()
+        if existing is not None and existing.is_pending_deletion:
+            return Response(
+                {'error': 'The account with this email is being deleted. You can register again once the deletion is complete.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if existing is not None:
             return Response({'error': 'A user with this email already exists.'}, status=status.HTTP_400_BAD_REQUEST)
 
         otp = random.randint(100000, 999999)
         request.session['registration_data'] = {'email': email, 'password': password, 'otp': otp}
 
+        # Imported here: the mail/SMTP stack is only needed by this endpoint
+        from django.core.mail import send_mail
         try:
             send_mail(
                 'Your Colace Account Verification Code',
@@ -144,6 +165,36 @@ class UserProfileView(generics.RetrieveAPIView):
 # ***** CHANGE SERIALIZER CLASS HERE *****
 class UserListView(generics.ListAPIView):
     queryset = User.objects.all()
-    serializer_class = UserSerializer # Use the correct serializer name
+    serializer_class = UserSearchSerializer
     filter_backends = [filters.SearchFilter]
-    search_fields = ['username', 'email'] # Allow searching by email too
\ No newline at end of file
+    search_fields = ['username', 'email'] # Allow searching by email too
+    throttle_scope = 'search'
+    throttle_classes = [UserTokenBucketThrottle]
+    sheddable = True # see core.db_metrics.LoadSheddingMiddleware
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # ?college=mine or ?college=iitb.ac.in, an indexed equality match
+        college = requested_college(self.request)
+        if college is not None:
+            queryset = queryset.filter(college_domain=college)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if not request.query_params.get(filters.SearchFilter.search_param):
+            return super().list(request, *args, **kwargs)
+        # Unanchored icontains search can't use an index, don't let it hog a connection
+        alias = router.db_for_read(User)
+        with statement_timeout(settings.SEARCH_STATEMENT_TIMEOUT_MS, using=alias):
+            return super().list(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        # ?relationship=1 adds follow flags for the whole result set with a single query
+        if kwargs.get('many') and self.request.query_params.get('relationship'):
+            users = list(args[0])
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'relationships': Follow.objects.status_for(self.request.user, [user.pk for user in users]),
+            }
+            args = (users,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
\ No newline at end of file